@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Owner account and admin logins shared by the backend test scripts.
+
+Registering and logging in costs two round trips plus a password hash on the
+server, so the first tester to ask for an owner token pays for it and every
+later tester in the process - or in a later run within AUTH_CACHE_TTL - reuses it.
+Logins to existing accounts (the seeded admin) are cached the same way.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+AUTH_CACHE_PATH = Path('.pytest_auth_cache.json')
+AUTH_CACHE_TTL = 30 * 60
+
+_tokens: Dict[str, Tuple[str, str]] = {}
+_logins: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+# Unique across xdist workers (pid) and across runs (start time), without a clock read per account
+_run_id = f"{int(time.time())}_{os.getpid()}"
+_uid_counter = itertools.count()
+
+def _register_and_login(api_url: str, session) -> Tuple[str, str]:
+    """Register a fresh owner and log in as them, returning (token, user_id)"""
+    uid = f"{_run_id}_{next(_uid_counter)}"
+    user_data = {
+        "email": f"test_owner_{uid}@example.com",
+        "name": f"Test Owner {uid}",
+        "password": "TestPassword123!",
+        "role": "owner",
+        "studio_name": "Test Dance Studio"
+    }
+
+    response = session.post(f"{api_url}/auth/register", json=user_data, timeout=10)
+    response.raise_for_status()
+    user_id = response.json().get('id')
+
+    login_data = {
+        "email": user_data['email'],
+        "password": user_data['password']
+    }
+    response = session.post(f"{api_url}/auth/login", json=login_data, timeout=10)
+    response.raise_for_status()
+    return response.json()['access_token'], user_id
+
+def _load_persisted(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        entry = json.loads(AUTH_CACHE_PATH.read_text()).get(key)
+    except (OSError, ValueError):
+        return None
+    if entry and time.time() - entry['created_at'] < AUTH_CACHE_TTL:
+        return entry
+    return None
+
+def _persist(key: str, entry: Optional[Dict[str, Any]]):
+    """Store entry under key, or drop the key when entry is None"""
+    try:
+        entries = json.loads(AUTH_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        entries = {}
+    if entry is None:
+        entries.pop(key, None)
+    else:
+        entries[key] = {**entry, "created_at": time.time()}
+    try:
+        AUTH_CACHE_PATH.write_text(json.dumps(entries))
+    except OSError:
+        pass  # Caching is best effort
+
+def get_owner_token(base_url: str, session=None, persist: bool = True) -> Tuple[str, str]:
+    """Return (token, user_id) for an owner on base_url, registering one only on first use.
+
+    Raises requests.exceptions.RequestException if the register/login round trip fails.
+    Pass persist=False for runs whose token must not outlive the process (e.g. mocked transports).
+    Callers that get a 401 with the token should call forget_owner_token.
+    """
+    with _lock:
+        if base_url in _tokens:
+            return _tokens[base_url]
+        entry = _load_persisted(base_url) if persist else None
+        if entry is not None:
+            _tokens[base_url] = entry['token'], entry['user_id']
+            return _tokens[base_url]
+
+    # Register outside the lock so other hosts' lookups don't wait on this round trip
+    registered = _register_and_login(f"{base_url}/api", session or requests)
+
+    with _lock:
+        if base_url in _tokens:
+            return _tokens[base_url]  # Another thread registered first; keep a single owner
+        if persist:
+            _persist(base_url, {"token": registered[0], "user_id": registered[1]})
+        _tokens[base_url] = registered
+        return registered
+
+def forget_owner_token(base_url: str):
+    """Drop an owner token the server has rejected, so the next get_owner_token registers again"""
+    with _lock:
+        _tokens.pop(base_url, None)
+        _persist(base_url, None)
+
+def get_login(base_url: str, email: str, password: str, session=None, persist: bool = True) -> Dict[str, Any]:
+    """Return the auth/login response for an existing account, logging in only on first use.
+
+    Raises requests.exceptions.RequestException if the login round trip fails.
+    """
+    key = f"{base_url}|{email}"
+    with _lock:
+        if key in _logins:
+            return _logins[key]
+
+        login = _load_persisted(key) if persist else None
+        if login is None:
+            response = (session or requests).post(f"{base_url}/api/auth/login",
+                                                  json={"email": email, "password": password}, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            login = {"access_token": data['access_token'], "user": data.get('user', {})}
+            if persist:
+                _persist(key, login)
+
+        _logins[key] = login
+        return login
+
+def forget_login(base_url: str, email: str):
+    """Drop a cached login the server has rejected, so the next get_login logs in again"""
+    key = f"{base_url}|{email}"
+    with _lock:
+        _logins.pop(key, None)
+        _persist(key, None)
@@ -1,12 +1,64 @@
 import requests
 import sys
 import json
+import os
+import re
+import threading
+import uuid
+import orjson
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Union
+from urllib.parse import urlparse
+
+from auth_cache import forget_owner_token, get_owner_token
+from script_support import build_session, script_logger, stdout_log_buffer
+
+# Output is buffered and written in batches instead of flushing stdout per line
+log_buffer = stdout_log_buffer()
+logger = script_logger("deleteauth", log_buffer)
+
+OFFLINE_TOKEN = "offline-owner-token"
+
+# Static request bodies, serialized once at import time
+SETUP_TEACHER_PAYLOAD = orjson.dumps({
+    "name": "Delete Test Teacher",
+    "email": "delete.teacher@example.com",
+    "phone": "+1555123456",
+    "specialties": ["ballet", "jazz"],
+    "bio": "Teacher for delete testing"
+})
+
+SETUP_STUDENT_PAYLOAD = orjson.dumps({
+    "name": "Delete Test Student",
+    "email": "delete.student@example.com",
+    "phone": "+1555654321",
+    "parent_name": "Delete Test Parent",
+    "parent_phone": "+1555654322",
+    "parent_email": "delete.parent@example.com",
+    "notes": "Student for delete testing"
+})
+
+NEGATIVE_TEACHER_PAYLOAD = orjson.dumps({
+    "name": "Negative Auth Delete Test Teacher",
+    "email": "negauth.teacher@example.com",
+    "phone": "+1555999888",
+    "specialties": ["contemporary"],
+    "bio": "Teacher for no-auth and invalid-auth delete testing"
+})
+
+NEGATIVE_STUDENT_PAYLOAD = orjson.dumps({
+    "name": "Negative Auth Delete Test Student",
+    "email": "negauth.student@example.com",
+    "phone": "+1555888777",
+    "notes": "Student for no-auth and invalid-auth delete testing"
+})
 
 class DeleteAuthenticationTester:
-    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
+    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com", use_cache: bool = True):
         self.base_url = base_url
+        self.use_cache = use_cache
         self.api_url = f"{base_url}/api"
         self.token = None
         self.user_id = None
@@ -15,134 +67,116 @@ class DeleteAuthenticationTester:
         self.created_teacher_id = None
         self.created_student_id = None
         self.created_lesson_id = None
+        now = datetime.now()
+        self._tomorrow = (now + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        self._counter_lock = threading.Lock()
+        self._cleanup = {'teachers': [], 'students': [], 'lessons': []}
+        self._neg_fixtures = {'teacher': None, 'student': None, 'lesson': None}
+        # Pools large enough for the concurrent setup/teardown calls
+        self.session = build_session(pool_connections=1)
+        self.noauth_session = build_session(pool_connections=1)
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name} - PASSED {details}")
-        else:
-            print(f"❌ {name} - FAILED {details}")
+        with self._counter_lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+                logger.info(f"✅ {name} - PASSED {details}")
+            else:
+                logger.info(f"❌ {name} - FAILED {details}")
 
-    def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200, use_auth: bool = True) -> tuple:
-        """Make HTTP request and return success status and response data"""
-        url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token and use_auth:
-            headers['Authorization'] = f'Bearer {self.token}'
+    def _send(self, session: requests.Session, method: str, endpoint: str, data: Union[Dict[Any, Any], bytes], accepted: tuple, headers: Dict[str, str] = None) -> tuple:
+        """Issue one request on ``session`` and parse the response.
 
+        The owner's Authorization header lives on ``self.session``; unauthenticated calls
+        go through ``self.noauth_session``. ``headers`` overrides it for a single request.
+        ``data`` may be a dict or a payload already serialized to JSON bytes.
+        """
+        body = orjson.dumps(data) if isinstance(data, dict) else data
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            response = session.request(method, f"{self.api_url}/{endpoint}", data=body, headers=headers, timeout=10)
 
-            success = response.status_code == expected_status
+            success = response.status_code in accepted
             
-            try:
-                response_data = response.json()
-            except:
-                response_data = {"raw_response": response.text, "status_code": response.status_code}
+            content_type = response.headers.get('content-type', '')
+            if 'application/json' in content_type and response.content:
+                response_data = orjson.loads(response.content)
+            else:
+                response_data = {"status_code": response.status_code, "body_len": len(response.content)}
+                if os.environ.get('DELETE_AUTH_DEBUG'):
+                    response_data["raw_response"] = response.text
 
             if not success:
-                print(f"   Status: {response.status_code}, Expected: {expected_status}")
-                print(f"   Response: {response_data}")
+                logger.info(f"   Status: {response.status_code}, Expected: {accepted}")
+                logger.info(f"   Response: {response_data}")
 
             return success, response_data
 
         except requests.exceptions.RequestException as e:
-            print(f"   Request failed: {str(e)}")
+            logger.info(f"   Request failed: {str(e)}")
             return False, {"error": str(e)}
 
+    # Specialised wrappers for the calls the delete tests make over and over
+
+    def _get_auth(self, endpoint: str, expected: tuple = (200,)) -> tuple:
+        return self._send(self.session, 'GET', endpoint, None, expected)
+
+    def _post(self, endpoint: str, data: Union[Dict[Any, Any], bytes], expected: tuple = (200,)) -> tuple:
+        return self._send(self.session, 'POST', endpoint, data, expected)
+
+    def _delete_auth(self, endpoint: str, expected: tuple = (200,)) -> tuple:
+        return self._send(self.session, 'DELETE', endpoint, None, expected)
+
+    def _delete_noauth(self, endpoint: str, expected: tuple = (401, 403)) -> tuple:
+        return self._send(self.noauth_session, 'DELETE', endpoint, None, expected)
+
+    def _delete_bad_auth(self, endpoint: str, token: str, expected: tuple = (401,)) -> tuple:
+        return self._send(self.session, 'DELETE', endpoint, None, expected, {'Authorization': f'Bearer {token}'})
+
     def test_user_registration_and_login(self):
-        """Test user registration and login for authentication"""
-        timestamp = datetime.now().strftime("%H%M%S")
-        user_data = {
-            "email": f"delete_test_owner_{timestamp}@example.com",
-            "name": f"Delete Test Owner {timestamp}",
-            "password": "DeleteTestPassword123!",
-            "role": "owner",
-            "studio_name": "Delete Test Dance Studio"
-        }
-        
-        # Register user
-        success, response = self.make_request('POST', 'auth/register', user_data, 200, use_auth=False)
-        
-        if success:
-            self.user_id = response.get('id')
-            self.test_email = user_data['email']
-            self.test_password = user_data['password']
-            
-        self.log_test("User Registration", success, f"- User ID: {self.user_id}")
-        
-        if not success:
-            return False
-            
-        # Login user
-        login_data = {
-            "email": self.test_email,
-            "password": self.test_password
-        }
-        
-        success, response = self.make_request('POST', 'auth/login', login_data, 200, use_auth=False)
-        
-        if success:
-            self.token = response.get('access_token')
-            
-        self.log_test("User Login", success, f"- Token received: {'Yes' if self.token else 'No'}")
+        """Authenticate as the shared test owner, registering one only when auth_cache has no token"""
+        for attempt in range(2):
+            try:
+                self.token, self.user_id = get_owner_token(self.base_url, self.noauth_session, persist=self.use_cache)
+            except requests.exceptions.RequestException as e:
+                logger.info(f"   Authentication failed: {str(e)}")
+                self.log_test("Owner Authentication", False, "- Token received: No")
+                return False
+                
+            self.session.headers['Authorization'] = f'Bearer {self.token}'
+            
+            # A cached token may predate a DB reset, so prove it on an owner-only endpoint
+            success, _ = self._get_auth('users')
+            if success or attempt:
+                break
+            forget_owner_token(self.base_url)
+            
+        self.log_test("Owner Authentication", success, f"- User ID: {self.user_id}")
         return success
 
     def setup_test_data(self):
         """Create test teacher, student, and lesson for delete testing"""
-        # Create teacher
-        teacher_data = {
-            "name": "Delete Test Teacher",
-            "email": "delete.teacher@example.com",
-            "phone": "+1555123456",
-            "specialties": ["ballet", "jazz"],
-            "bio": "Teacher for delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'teachers', teacher_data, 200)
-        if success:
-            self.created_teacher_id = response.get('id')
-            
-        self.log_test("Setup Test Teacher", success, f"- Teacher ID: {self.created_teacher_id}")
-        
-        if not success:
-            return False
-            
-        # Create student
-        student_data = {
-            "name": "Delete Test Student",
-            "email": "delete.student@example.com",
-            "phone": "+1555654321",
-            "parent_name": "Delete Test Parent",
-            "parent_phone": "+1555654322",
-            "parent_email": "delete.parent@example.com",
-            "notes": "Student for delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'students', student_data, 200)
-        if success:
-            self.created_student_id = response.get('id')
-            
-        self.log_test("Setup Test Student", success, f"- Student ID: {self.created_student_id}")
-        
-        if not success:
+        # Teacher and student are independent - create them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            teacher_future = executor.submit(self._post, 'teachers', SETUP_TEACHER_PAYLOAD)
+            student_future = executor.submit(self._post, 'students', SETUP_STUDENT_PAYLOAD)
+            teacher_success, teacher_response = teacher_future.result()
+            student_success, student_response = student_future.result()
+        
+        if teacher_success:
+            self.created_teacher_id = teacher_response.get('id')
+        if student_success:
+            self.created_student_id = student_response.get('id')
+            
+        self.log_test("Setup Test Teacher", teacher_success, f"- Teacher ID: {self.created_teacher_id}")
+        self.log_test("Setup Test Student", student_success, f"- Student ID: {self.created_student_id}")
+        
+        if not (teacher_success and student_success):
             return False
             
         # Create lesson
-        tomorrow = datetime.now() + timedelta(days=1)
-        start_time = tomorrow.replace(hour=14, minute=0, second=0, microsecond=0)
+        start_time = self._tomorrow.replace(hour=14)
         
         lesson_data = {
             "student_id": self.created_student_id,
@@ -152,20 +186,72 @@ class DeleteAuthenticationTester:
             "notes": "Lesson for delete testing"
         }
         
-        success, response = self.make_request('POST', 'lessons', lesson_data, 200)
+        success, response = self._post('lessons', lesson_data)
         if success:
             self.created_lesson_id = response.get('id')
             
         self.log_test("Setup Test Lesson", success, f"- Lesson ID: {self.created_lesson_id}")
         return success
 
+    def setup_negative_fixtures(self):
+        """Create one teacher, student, and lesson shared by the no-auth and invalid-auth tests"""
+        # Failed deletes leave these records in place, so both negative variants can reuse them
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            teacher_future = executor.submit(self._post, 'teachers', NEGATIVE_TEACHER_PAYLOAD)
+            student_future = executor.submit(self._post, 'students', NEGATIVE_STUDENT_PAYLOAD)
+            teacher_success, teacher_response = teacher_future.result()
+            student_success, student_response = student_future.result()
+        
+        if teacher_success:
+            self._neg_fixtures['teacher'] = teacher_response.get('id')
+            self._cleanup['teachers'].append(self._neg_fixtures['teacher'])
+        if student_success:
+            self._neg_fixtures['student'] = student_response.get('id')
+            self._cleanup['students'].append(self._neg_fixtures['student'])
+            
+        self.log_test("Setup Negative-Auth Teacher", teacher_success, f"- Teacher ID: {self._neg_fixtures['teacher']}")
+        self.log_test("Setup Negative-Auth Student", student_success, f"- Student ID: {self._neg_fixtures['student']}")
+        
+        if not (teacher_success and student_success):
+            return False
+            
+        start_time = self._tomorrow.replace(hour=15)
+        
+        lesson_data = {
+            "student_id": self._neg_fixtures['student'],
+            "teacher_id": self._neg_fixtures['teacher'],
+            "start_datetime": start_time.isoformat(),
+            "duration_minutes": 60,
+            "notes": "Lesson for no-auth and invalid-auth delete testing"
+        }
+        
+        success, response = self._post('lessons', lesson_data)
+        if success:
+            self._neg_fixtures['lesson'] = response.get('id')
+            self._cleanup['lessons'].append(self._neg_fixtures['lesson'])
+            
+        self.log_test("Setup Negative-Auth Lesson", success, f"- Lesson ID: {self._neg_fixtures['lesson']}")
+        return success
+
+    def setup_all_test_data(self):
+        """Run the valid-auth and negative-auth setup pipelines side by side.
+
+        Each lesson POST depends on its own teacher and student, but the two
+        pipelines share nothing, so they overlap instead of running back to back.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            valid_future = executor.submit(self.setup_test_data)
+            negative_future = executor.submit(self.setup_negative_fixtures)
+            negative_future.result()
+            return valid_future.result()
+
     def test_delete_teacher_with_valid_auth(self):
         """Test deleting teacher with valid authentication"""
         if not self.created_teacher_id:
             self.log_test("Delete Teacher with Valid Auth", False, "- No teacher ID available")
             return False
             
-        success, response = self.make_request('DELETE', f'teachers/{self.created_teacher_id}', expected_status=200)
+        success, response = self._delete_auth(f'teachers/{self.created_teacher_id}')
         
         if success:
             message = response.get('message', '')
@@ -178,69 +264,28 @@ class DeleteAuthenticationTester:
 
     def test_delete_teacher_without_auth(self):
         """Test deleting teacher without authentication (should fail)"""
-        # Create another teacher for this test
-        teacher_data = {
-            "name": "No Auth Delete Test Teacher",
-            "email": "noauth.teacher@example.com",
-            "phone": "+1555999888",
-            "specialties": ["contemporary"],
-            "bio": "Teacher for no-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'teachers', teacher_data, 200)
-        if not success:
-            self.log_test("Delete Teacher without Auth", False, "- Failed to create test teacher")
+        teacher_id = self._neg_fixtures['teacher']
+        if not teacher_id:
+            self.log_test("Delete Teacher without Auth", False, "- No negative-auth teacher available")
             return False
             
-        teacher_id = response.get('id')
-        
         # Try to delete without authentication (should fail with 403 or 401)
-        success, response = self.make_request('DELETE', f'teachers/{teacher_id}', expected_status=403, use_auth=False)
+        success, response = self._delete_noauth(f'teachers/{teacher_id}')
         
-        # If 403 didn't work, try 401
-        if not success:
-            success, response = self.make_request('DELETE', f'teachers/{teacher_id}', expected_status=401, use_auth=False)
-            
         self.log_test("Delete Teacher without Auth", success, f"- Expected auth error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Clean up - delete with auth
-        if teacher_id:
-            self.make_request('DELETE', f'teachers/{teacher_id}', expected_status=200)
-            
         return success
 
     def test_delete_teacher_with_invalid_auth(self):
         """Test deleting teacher with invalid authentication token"""
-        # Create another teacher for this test
-        teacher_data = {
-            "name": "Invalid Auth Delete Test Teacher",
-            "email": "invalidauth.teacher@example.com",
-            "phone": "+1555777666",
-            "specialties": ["tap"],
-            "bio": "Teacher for invalid-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'teachers', teacher_data, 200)
-        if not success:
-            self.log_test("Delete Teacher with Invalid Auth", False, "- Failed to create test teacher")
+        teacher_id = self._neg_fixtures['teacher']
+        if not teacher_id:
+            self.log_test("Delete Teacher with Invalid Auth", False, "- No negative-auth teacher available")
             return False
             
-        teacher_id = response.get('id')
-        
-        # Save original token and use invalid token
-        original_token = self.token
-        self.token = "invalid_token_12345"
-        
         # Try to delete with invalid token (should fail with 401)
-        success, response = self.make_request('DELETE', f'teachers/{teacher_id}', expected_status=401)
+        success, response = self._delete_bad_auth(f'teachers/{teacher_id}', "invalid_token_12345")
         
         self.log_test("Delete Teacher with Invalid Auth", success, f"- Expected 401 error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Restore original token and clean up
-        self.token = original_token
-        if teacher_id:
-            self.make_request('DELETE', f'teachers/{teacher_id}', expected_status=200)
-            
         return success
 
     def test_delete_student_with_valid_auth(self):
@@ -249,7 +294,7 @@ class DeleteAuthenticationTester:
             self.log_test("Delete Student with Valid Auth", False, "- No student ID available")
             return False
             
-        success, response = self.make_request('DELETE', f'students/{self.created_student_id}', expected_status=200)
+        success, response = self._delete_auth(f'students/{self.created_student_id}')
         
         if success:
             message = response.get('message', '')
@@ -262,67 +307,28 @@ class DeleteAuthenticationTester:
 
     def test_delete_student_without_auth(self):
         """Test deleting student without authentication (should fail)"""
-        # Create another student for this test
-        student_data = {
-            "name": "No Auth Delete Test Student",
-            "email": "noauth.student@example.com",
-            "phone": "+1555888777",
-            "notes": "Student for no-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'students', student_data, 200)
-        if not success:
-            self.log_test("Delete Student without Auth", False, "- Failed to create test student")
+        student_id = self._neg_fixtures['student']
+        if not student_id:
+            self.log_test("Delete Student without Auth", False, "- No negative-auth student available")
             return False
             
-        student_id = response.get('id')
-        
         # Try to delete without authentication (should fail with 403 or 401)
-        success, response = self.make_request('DELETE', f'students/{student_id}', expected_status=403, use_auth=False)
+        success, response = self._delete_noauth(f'students/{student_id}')
         
-        # If 403 didn't work, try 401
-        if not success:
-            success, response = self.make_request('DELETE', f'students/{student_id}', expected_status=401, use_auth=False)
-            
         self.log_test("Delete Student without Auth", success, f"- Expected auth error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Clean up - delete with auth
-        if student_id:
-            self.make_request('DELETE', f'students/{student_id}', expected_status=200)
-            
         return success
 
     def test_delete_student_with_invalid_auth(self):
         """Test deleting student with invalid authentication token"""
-        # Create another student for this test
-        student_data = {
-            "name": "Invalid Auth Delete Test Student",
-            "email": "invalidauth.student@example.com",
-            "phone": "+1555666555",
-            "notes": "Student for invalid-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'students', student_data, 200)
-        if not success:
-            self.log_test("Delete Student with Invalid Auth", False, "- Failed to create test student")
+        student_id = self._neg_fixtures['student']
+        if not student_id:
+            self.log_test("Delete Student with Invalid Auth", False, "- No negative-auth student available")
             return False
             
-        student_id = response.get('id')
-        
-        # Save original token and use invalid token
-        original_token = self.token
-        self.token = "invalid_token_67890"
-        
         # Try to delete with invalid token (should fail with 401)
-        success, response = self.make_request('DELETE', f'students/{student_id}', expected_status=401)
+        success, response = self._delete_bad_auth(f'students/{student_id}', "invalid_token_67890")
         
         self.log_test("Delete Student with Invalid Auth", success, f"- Expected 401 error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Restore original token and clean up
-        self.token = original_token
-        if student_id:
-            self.make_request('DELETE', f'students/{student_id}', expected_status=200)
-            
         return success
 
     def test_delete_lesson_with_valid_auth(self):
@@ -331,7 +337,7 @@ class DeleteAuthenticationTester:
             self.log_test("Delete Lesson with Valid Auth", False, "- No lesson ID available")
             return False
             
-        success, response = self.make_request('DELETE', f'lessons/{self.created_lesson_id}', expected_status=200)
+        success, response = self._delete_auth(f'lessons/{self.created_lesson_id}')
         
         if success:
             message = response.get('message', '')
@@ -341,83 +347,28 @@ class DeleteAuthenticationTester:
 
     def test_delete_lesson_without_auth(self):
         """Test deleting lesson without authentication (should fail)"""
-        # Create another lesson for this test
-        if not self.created_teacher_id or not self.created_student_id:
-            self.log_test("Delete Lesson without Auth", False, "- No teacher or student ID available")
-            return False
-            
-        tomorrow = datetime.now() + timedelta(days=1)
-        start_time = tomorrow.replace(hour=15, minute=0, second=0, microsecond=0)
-        
-        lesson_data = {
-            "student_id": self.created_student_id,
-            "teacher_id": self.created_teacher_id,
-            "start_datetime": start_time.isoformat(),
-            "duration_minutes": 60,
-            "notes": "Lesson for no-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'lessons', lesson_data, 200)
-        if not success:
-            self.log_test("Delete Lesson without Auth", False, "- Failed to create test lesson")
+        lesson_id = self._neg_fixtures['lesson']
+        if not lesson_id:
+            self.log_test("Delete Lesson without Auth", False, "- No negative-auth lesson available")
             return False
             
-        lesson_id = response.get('id')
-        
         # Try to delete without authentication (should fail with 403 or 401)
-        success, response = self.make_request('DELETE', f'lessons/{lesson_id}', expected_status=403, use_auth=False)
+        success, response = self._delete_noauth(f'lessons/{lesson_id}')
         
-        # If 403 didn't work, try 401
-        if not success:
-            success, response = self.make_request('DELETE', f'lessons/{lesson_id}', expected_status=401, use_auth=False)
-            
         self.log_test("Delete Lesson without Auth", success, f"- Expected auth error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Clean up - delete with auth
-        if lesson_id:
-            self.make_request('DELETE', f'lessons/{lesson_id}', expected_status=200)
-            
         return success
 
     def test_delete_lesson_with_invalid_auth(self):
         """Test deleting lesson with invalid authentication token"""
-        # Create another lesson for this test
-        if not self.created_teacher_id or not self.created_student_id:
-            self.log_test("Delete Lesson with Invalid Auth", False, "- No teacher or student ID available")
-            return False
-            
-        tomorrow = datetime.now() + timedelta(days=1)
-        start_time = tomorrow.replace(hour=16, minute=0, second=0, microsecond=0)
-        
-        lesson_data = {
-            "student_id": self.created_student_id,
-            "teacher_id": self.created_teacher_id,
-            "start_datetime": start_time.isoformat(),
-            "duration_minutes": 60,
-            "notes": "Lesson for invalid-auth delete testing"
-        }
-        
-        success, response = self.make_request('POST', 'lessons', lesson_data, 200)
-        if not success:
-            self.log_test("Delete Lesson with Invalid Auth", False, "- Failed to create test lesson")
+        lesson_id = self._neg_fixtures['lesson']
+        if not lesson_id:
+            self.log_test("Delete Lesson with Invalid Auth", False, "- No negative-auth lesson available")
             return False
             
-        lesson_id = response.get('id')
-        
-        # Save original token and use invalid token
-        original_token = self.token
-        self.token = "invalid_token_lesson_123"
-        
         # Try to delete with invalid token (should fail with 401)
-        success, response = self.make_request('DELETE', f'lessons/{lesson_id}', expected_status=401)
+        success, response = self._delete_bad_auth(f'lessons/{lesson_id}', "invalid_token_lesson_123")
         
         self.log_test("Delete Lesson with Invalid Auth", success, f"- Expected 401 error, got status: {response.get('status_code', 'unknown')}")
-        
-        # Restore original token and clean up
-        self.token = original_token
-        if lesson_id:
-            self.make_request('DELETE', f'lessons/{lesson_id}', expected_status=200)
-            
         return success
 
     def test_delete_nonexistent_records(self):
@@ -425,73 +376,158 @@ class DeleteAuthenticationTester:
         fake_ids = ["nonexistent-teacher-id", "nonexistent-student-id", "nonexistent-lesson-id"]
         
         # Test teacher
-        success, response = self.make_request('DELETE', f'teachers/{fake_ids[0]}', expected_status=404)
+        success, response = self._delete_auth(f'teachers/{fake_ids[0]}', expected=(404,))
         self.log_test("Delete Nonexistent Teacher", success, "- Expected 404 error")
         
         # Test student  
-        success, response = self.make_request('DELETE', f'students/{fake_ids[1]}', expected_status=404)
+        success, response = self._delete_auth(f'students/{fake_ids[1]}', expected=(404,))
         self.log_test("Delete Nonexistent Student", success, "- Expected 404 error")
         
         # Test lesson
-        success, response = self.make_request('DELETE', f'lessons/{fake_ids[2]}', expected_status=404)
+        success, response = self._delete_auth(f'lessons/{fake_ids[2]}', expected=(404,))
         self.log_test("Delete Nonexistent Lesson", success, "- Expected 404 error")
         
         return True
 
+    def teardown(self):
+        """Delete every record queued for cleanup concurrently with valid auth"""
+        pending = [f'{kind}/{record_id}' for kind, ids in self._cleanup.items() for record_id in ids]
+        if not pending:
+            return
+            
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            list(executor.map(self._delete_auth, pending))
+            
+        self._cleanup = {kind: [] for kind in self._cleanup}
+
     def run_delete_auth_tests(self):
         """Run all delete authentication tests"""
-        print("🔐 Starting Delete Functionality Authentication Tests")
-        print(f"🌐 Testing against: {self.base_url}")
-        print("=" * 60)
+        logger.info("🔐 Starting Delete Functionality Authentication Tests")
+        logger.info(f"🌐 Testing against: {self.base_url}")
+        logger.info("=" * 60)
         
         # Setup authentication
-        print("\n📝 Authentication Setup:")
+        logger.info("\n📝 Authentication Setup:")
         if not self.test_user_registration_and_login():
-            print("❌ Authentication setup failed. Cannot continue with delete tests.")
+            logger.info("❌ Authentication setup failed. Cannot continue with delete tests.")
             return 1
             
         # Setup test data
-        print("\n🏗️ Test Data Setup:")
-        if not self.setup_test_data():
-            print("❌ Test data setup failed. Cannot continue with delete tests.")
+        logger.info("\n🏗️ Test Data Setup:")
+        if not self.setup_all_test_data():
+            logger.info("❌ Test data setup failed. Cannot continue with delete tests.")
             return 1
             
         # Delete tests with valid authentication
-        print("\n✅ Delete Tests with Valid Authentication:")
+        logger.info("\n✅ Delete Tests with Valid Authentication:")
         self.test_delete_teacher_with_valid_auth()
         self.test_delete_student_with_valid_auth()
         self.test_delete_lesson_with_valid_auth()
         
         # Delete tests without authentication
-        print("\n🚫 Delete Tests without Authentication:")
+        logger.info("\n🚫 Delete Tests without Authentication:")
         self.test_delete_teacher_without_auth()
         self.test_delete_student_without_auth()
         self.test_delete_lesson_without_auth()
         
         # Delete tests with invalid authentication
-        print("\n🔑 Delete Tests with Invalid Authentication:")
+        logger.info("\n🔑 Delete Tests with Invalid Authentication:")
         self.test_delete_teacher_with_invalid_auth()
         self.test_delete_student_with_invalid_auth()
         self.test_delete_lesson_with_invalid_auth()
         
         # Delete tests for non-existent records
-        print("\n🔍 Delete Tests for Non-existent Records:")
+        logger.info("\n🔍 Delete Tests for Non-existent Records:")
         self.test_delete_nonexistent_records()
         
+        # Clean up the shared negative-auth fixtures
+        self.teardown()
+        
         # Final results
-        print("\n" + "=" * 60)
-        print(f"📊 Delete Authentication Test Results: {self.tests_passed}/{self.tests_run} tests passed")
+        logger.info("\n" + "=" * 60)
+        logger.info(f"📊 Delete Authentication Test Results: {self.tests_passed}/{self.tests_run} tests passed")
         
         if self.tests_passed == self.tests_run:
-            print("🎉 All delete authentication tests passed!")
+            logger.info("🎉 All delete authentication tests passed!")
             return 0
         else:
-            print(f"⚠️  {self.tests_run - self.tests_passed} tests failed")
+            logger.info(f"⚠️  {self.tests_run - self.tests_passed} tests failed")
             return 1
 
-def main():
+# pytest entry points - each check becomes its own test so runs can be
+# sharded with pytest-xdist (use --dist=loadfile to keep one owner per file)
+
+RESOURCES = ("teacher", "student", "lesson")
+
+@pytest.fixture(scope="module")
+def tester():
     tester = DeleteAuthenticationTester()
-    return tester.run_delete_auth_tests()
+    if not tester.test_user_registration_and_login():
+        pytest.skip("Authentication setup failed")
+    if not tester.setup_all_test_data():
+        pytest.skip("Test data setup failed")
+    yield tester
+    tester.teardown()
+    log_buffer.flush()
+
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_with_valid_auth(tester, resource):
+    assert getattr(tester, f"test_delete_{resource}_with_valid_auth")()
+
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_without_auth(tester, resource):
+    assert getattr(tester, f"test_delete_{resource}_without_auth")()
+
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_with_invalid_auth(tester, resource):
+    assert getattr(tester, f"test_delete_{resource}_with_invalid_auth")()
+
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_nonexistent_record(tester, resource):
+    success, _ = tester._delete_auth(f'{resource}s/nonexistent-{resource}-id', expected=(404,))
+    assert success
+
+def offline_api_response(request):
+    """Answer an API call in-process the way the backend does for these tests"""
+    endpoint = urlparse(request.url).path.split('/api/', 1)[-1]
+    authorization = request.headers.get('Authorization')
+    json_headers = {'Content-Type': 'application/json'}
+    
+    if endpoint == 'auth/register':
+        return 200, json_headers, json.dumps({"id": "offline-owner"})
+    if endpoint == 'auth/login':
+        return 200, json_headers, json.dumps({"access_token": OFFLINE_TOKEN, "token_type": "bearer"})
+    if authorization is None:
+        return 403, json_headers, json.dumps({"detail": "Not authenticated"})
+    if authorization != f'Bearer {OFFLINE_TOKEN}':
+        return 401, json_headers, json.dumps({"detail": "Invalid token"})
+    if request.method == 'POST':
+        return 200, json_headers, json.dumps({"id": str(uuid.uuid4())})
+    if request.method == 'DELETE':
+        if endpoint.split('/', 1)[-1].startswith('nonexistent'):
+            return 404, json_headers, json.dumps({"detail": "Not found"})
+        return 200, json_headers, json.dumps({"message": "Deleted successfully"})
+    return 200, json_headers, json.dumps([])
+
+def run_offline(tester: DeleteAuthenticationTester) -> int:
+    """Run the suite against an in-process mock of the API instead of the preview host"""
+    import responses
+    
+    api_pattern = re.compile(re.escape(tester.api_url) + r"/.*")
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        for method in ('GET', 'POST', 'PUT', 'DELETE'):
+            mock.add_callback(method, api_pattern, callback=offline_api_response)
+        return tester.run_delete_auth_tests()
+
+def main():
+    offline = "--offline" in sys.argv
+    tester = DeleteAuthenticationTester(use_cache=not offline and "--no-cache" not in sys.argv)
+    try:
+        if offline:
+            return run_offline(tester)
+        return tester.run_delete_auth_tests()
+    finally:
+        log_buffer.flush()
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
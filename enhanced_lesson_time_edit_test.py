@@ -1,12 +1,46 @@
 import requests
+import os
 import sys
+import threading
+import time
 import json
+import orjson
+import re
+import uuid
+import pytest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
 from typing import Dict, Any
+from urllib.parse import urlparse
+
+from auth_cache import forget_owner_token, get_owner_token
+from script_support import build_session
+
+_FIXTURE_CACHE = Path('.lesson_fixtures.json')
+
+def _parse(value: str) -> datetime:
+    """Parse an API timestamp as naive - a trailing Z makes it aware on 3.11+, and never == a naive time"""
+    return datetime.fromisoformat(value.replace('Z', '')).replace(tzinfo=None)
+
+# Cached GET responses live this long; a write to a resource also drops reads derived from it
+_GET_CACHE_TTL = 2.0
+_CACHE_DEPENDENTS = {
+    'lessons': ('lessons', 'calendar'),
+    'enrollments': ('enrollments', 'students'),
+}
 
 class EnhancedLessonTimeEditTester:
-    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
+    """Lesson time edit checks against the preview API (or MockStudioAPI with --mode=mock).
+
+    Per-update progress lines are only printed with TEST_VERBOSE=1; otherwise
+    they are held back and shown only for checks that fail.
+    """
+
+    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com", use_cache: bool = True):
         self.base_url = base_url
+        self.use_cache = use_cache
         self.api_url = f"{base_url}/api"
         self.token = None
         self.user_id = None
@@ -20,38 +54,92 @@ class EnhancedLessonTimeEditTester:
         self.created_teacher_id_3 = None
         self.created_enrollment_id = None
         self.test_lesson_id = None
+        
+        # Every lesson time is an offset from one frozen timestamp so a run is reproducible
+        self.base_now = datetime.now().replace(second=0, microsecond=0)
+        
+        # One pooled keep-alive session for every request
+        self.session = build_session()
+        # Fixture validation and the final-state reads use the GET cache from worker threads
+        self._cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self._details = threading.local()
+        self.verbose = os.environ.get('TEST_VERBOSE') == '1'
+
+    # Single-PUT update cases: (name, days ahead, (hour, minute), extra fields, expected duration or None
+    # to skip the duration check). teacher_ids hold created_teacher_id_<n> indexes resolved at request time.
+    UPDATE_CASES = (
+        ("Update Lesson Date", 2, (14, 0), {}, 60),
+        ("Update Lesson Time", 2, (16, 30), {}, 60),
+        ("Update DateTime and Duration", 3, (10, 0), {"duration_minutes": 90}, 90),
+        ("Update DateTime + Multiple Instructors", 4, (11, 30), {"teacher_ids": (1, 2), "duration_minutes": 75}, 75),
+        ("Update DateTime + Booking Type", 5, (15, 0),
+         {"booking_type": "training", "notes": "Updated to training session with new time"}, None),
+        ("Update All Fields Simultaneously", 6, (13, 15),
+         {"duration_minutes": 120, "teacher_ids": (2, 3), "booking_type": "party",
+          "notes": "Comprehensive update: Party lesson with multiple instructors and extended duration"}, 120),
+    )
+
+    def lesson_time(self, days_ahead: int, hour: int, minute: int = 0) -> datetime:
+        """Lesson start `days_ahead` days after base_now at hour:minute"""
+        return (self.base_now + timedelta(days=days_ahead)).replace(hour=hour, minute=minute)
+
+    def detail(self, line: str):
+        """Diagnostic output - printed when verbose, otherwise held until the check's log_test"""
+        if self.verbose:
+            print(line)
+        else:
+            if getattr(self._details, 'lines', None) is None:
+                self._details.lines = []
+            self._details.lines.append(line)
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
-        self.tests_run += 1
+        held, self._details.lines = getattr(self._details, 'lines', None) or [], None
+        if not success:
+            for line in held:
+                print(line)
+        with self._counter_lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
         if success:
-            self.tests_passed += 1
             print(f"✅ {name} - PASSED {details}")
         else:
             print(f"❌ {name} - FAILED {details}")
 
+    def invalidate_cache(self, endpoint: str):
+        """Drop cached GETs for the written resource and any endpoint derived from it"""
+        resource = endpoint.split('/', 1)[0]
+        prefixes = _CACHE_DEPENDENTS.get(resource, (resource,))
+        with self._cache_lock:
+            self._cache = {k: v for k, v in self._cache.items() if not k.startswith(prefixes)}
+
     def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200) -> tuple:
         """Make HTTP request and return success status and response data"""
+        method = method.upper()
+        cacheable = method == 'GET' and expected_status == 200
+        if cacheable:
+            with self._cache_lock:
+                cached = self._cache.get(endpoint)
+            if cached and time.monotonic() - cached[0] < _GET_CACHE_TTL:
+                return True, cached[1]
+        elif method != 'GET':
+            self.invalidate_cache(endpoint)
+            
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
+        body = orjson.dumps(data) if data is not None else None
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            response = self.session.request(method, url, data=body, timeout=10)
 
             success = response.status_code == expected_status
             
+            if response.status_code == 401 and self.token:
+                # Make the next run register again instead of reusing a token the server rejects
+                forget_owner_token(self.base_url)
+            
             try:
                 response_data = response.json()
             except:
@@ -60,6 +148,9 @@ class EnhancedLessonTimeEditTester:
             if not success:
                 print(f"   Status: {response.status_code}, Expected: {expected_status}")
                 print(f"   Response: {response_data}")
+            elif cacheable:
+                with self._cache_lock:
+                    self._cache[endpoint] = (time.monotonic(), response_data)
 
             return success, response_data
 
@@ -67,40 +158,68 @@ class EnhancedLessonTimeEditTester:
             print(f"   Request failed: {str(e)}")
             return False, {"error": str(e)}
 
-    def setup_test_data(self):
-        """Setup test data for lesson time edit testing"""
-        print("\n🔧 Setting up test data...")
+    def load_cached_fixtures(self) -> bool:
+        """Reuse the token and records created by a previous run if they are still valid"""
+        try:
+            cached = json.loads(_FIXTURE_CACHE.read_text())
+        except (OSError, ValueError):
+            return False
+            
+        if cached.get('base_url') != self.base_url or not cached.get('token'):
+            return False
+            
+        self.session.headers['Authorization'] = f"Bearer {cached['token']}"
         
-        # Register and login user
-        timestamp = datetime.now().strftime("%H%M%S")
-        user_data = {
-            "email": f"lesson_edit_test_{timestamp}@example.com",
-            "name": f"Lesson Edit Tester {timestamp}",
-            "password": "TestPassword123!",
-            "role": "owner",
-            "studio_name": "Test Dance Studio"
-        }
+        # Validate the token and the fixture records in one round trip
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            token_future = executor.submit(self.make_request, 'GET', 'users', None, 200)
+            student_future = executor.submit(self.make_request, 'GET', f"students/{cached.get('student_id')}", None, 200)
+            token_valid, _ = token_future.result()
+            student_exists, _ = student_future.result()
         
-        success, response = self.make_request('POST', 'auth/register', user_data, 200)
-        if not success:
-            print("❌ Failed to register user")
+        if not (token_valid and student_exists):
+            del self.session.headers['Authorization']
             return False
             
-        # Login
-        login_data = {
-            "email": user_data['email'],
-            "password": user_data['password']
+        self.token = cached['token']
+        self.created_student_id = cached['student_id']
+        self.created_teacher_id_1, self.created_teacher_id_2, self.created_teacher_id_3 = cached['teacher_ids']
+        self.created_enrollment_id = cached['enrollment_id']
+        return True
+
+    def save_cached_fixtures(self):
+        """Persist the token and created record IDs for the next run"""
+        cached = {
+            "base_url": self.base_url,
+            "token": self.token,
+            "student_id": self.created_student_id,
+            "teacher_ids": [self.created_teacher_id_1, self.created_teacher_id_2, self.created_teacher_id_3],
+            "enrollment_id": self.created_enrollment_id
         }
+        try:
+            _FIXTURE_CACHE.write_text(json.dumps(cached))
+        except OSError as e:
+            print(f"   Could not write fixture cache: {str(e)}")
+
+    def setup_test_data(self):
+        """Setup test data for lesson time edit testing"""
+        print("\n🔧 Setting up test data...")
         
-        success, response = self.make_request('POST', 'auth/login', login_data, 200)
-        if not success:
-            print("❌ Failed to login")
+        if self.use_cache and self.load_cached_fixtures():
+            print("✅ Reusing cached test data from previous run\n")
+            return True
+            
+        # Owner token is shared with the other testers and cached between runs
+        try:
+            self.token, self.user_id = get_owner_token(self.base_url, self.session, persist=self.use_cache)
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Failed to authenticate: {str(e)}")
             return False
             
-        self.token = response.get('access_token')
+        self.session.headers['Authorization'] = f'Bearer {self.token}'
         print(f"✅ User authenticated")
         
-        # Create test student
+        # Create test student and teachers - none depend on each other
         student_data = {
             "name": "Isabella Martinez",
             "email": "isabella.martinez@example.com",
@@ -108,15 +227,6 @@ class EnhancedLessonTimeEditTester:
             "notes": "Student for lesson time edit testing"
         }
         
-        success, response = self.make_request('POST', 'students', student_data, 200)
-        if not success:
-            print("❌ Failed to create test student")
-            return False
-            
-        self.created_student_id = response.get('id')
-        print(f"✅ Created test student: {student_data['name']}")
-        
-        # Create multiple test teachers
         teachers_data = [
             {
                 "name": "Sofia Rodriguez",
@@ -141,9 +251,22 @@ class EnhancedLessonTimeEditTester:
             }
         ]
         
+        with ThreadPoolExecutor(max_workers=1 + len(teachers_data)) as executor:
+            student_future = executor.submit(self.make_request, 'POST', 'students', student_data, 200)
+            teacher_futures = [executor.submit(self.make_request, 'POST', 'teachers', teacher_data, 200)
+                               for teacher_data in teachers_data]
+            success, response = student_future.result()
+            teacher_results = [future.result() for future in teacher_futures]
+        
+        if not success:
+            print("❌ Failed to create test student")
+            return False
+            
+        self.created_student_id = response.get('id')
+        print(f"✅ Created test student: {student_data['name']}")
+        
         teacher_ids = []
-        for teacher_data in teachers_data:
-            success, response = self.make_request('POST', 'teachers', teacher_data, 200)
+        for teacher_data, (success, response) in zip(teachers_data, teacher_results):
             if not success:
                 print(f"❌ Failed to create teacher: {teacher_data['name']}")
                 return False
@@ -168,19 +291,21 @@ class EnhancedLessonTimeEditTester:
         self.created_enrollment_id = response.get('id')
         print(f"✅ Created test enrollment with 20 lessons")
         
+        if self.use_cache:
+            self.save_cached_fixtures()
+            
         print("✅ Test data setup complete!\n")
         return True
 
     def test_create_initial_lesson(self):
         """Create initial lesson for time edit testing"""
         # Create lesson for tomorrow at 2:00 PM
-        tomorrow = datetime.now() + timedelta(days=1)
-        start_time = tomorrow.replace(hour=14, minute=0, second=0, microsecond=0)
+        start_time = self.lesson_time(1, 14)
         
         lesson_data = {
             "student_id": self.created_student_id,
             "teacher_ids": [self.created_teacher_id_1],
-            "start_datetime": start_time.isoformat(),
+            "start_datetime": start_time,
             "duration_minutes": 60,
             "booking_type": "private_lesson",
             "notes": "Initial lesson for time edit testing",
@@ -188,6 +313,7 @@ class EnhancedLessonTimeEditTester:
         }
         
         success, response = self.make_request('POST', 'lessons', lesson_data, 200)
+        teacher_names = []
         
         if success:
             self.test_lesson_id = response.get('id')
@@ -202,233 +328,38 @@ class EnhancedLessonTimeEditTester:
                      f"- Lesson ID: {self.test_lesson_id}, Teacher: {teacher_names[0] if teacher_names else 'None'}")
         return success
 
-    def test_update_lesson_start_datetime_different_date(self):
-        """Test updating lesson start_datetime to different date"""
-        if not self.test_lesson_id:
-            self.log_test("Update Lesson Date", False, "- No test lesson available")
-            return False
-            
-        # Update to day after tomorrow at same time
-        day_after_tomorrow = datetime.now() + timedelta(days=2)
-        new_start_time = day_after_tomorrow.replace(hour=14, minute=0, second=0, microsecond=0)
-        
-        update_data = {
-            "start_datetime": new_start_time.isoformat()
-        }
-        
-        success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
-        
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_end = response.get('end_datetime')
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
-            
-            # Verify date was updated and duration preserved (60 minutes)
-            duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
-            date_updated = updated_start_dt.date() == new_start_time.date()
-            duration_preserved = abs(duration_minutes - 60) < 1  # Allow small floating point differences
-            
-            success = success and date_updated and duration_preserved
-            
-        self.log_test("Update Lesson Date", success, 
-                     f"- New date: {new_start_time.date()}, Duration preserved: {duration_preserved}")
-        return success
-
-    def test_update_lesson_start_datetime_different_time(self):
-        """Test updating lesson start_datetime to different time same day"""
-        if not self.test_lesson_id:
-            self.log_test("Update Lesson Time", False, "- No test lesson available")
-            return False
-            
-        # Update to 4:30 PM same day
-        day_after_tomorrow = datetime.now() + timedelta(days=2)
-        new_start_time = day_after_tomorrow.replace(hour=16, minute=30, second=0, microsecond=0)
-        
-        update_data = {
-            "start_datetime": new_start_time.isoformat()
-        }
-        
-        success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
-        
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_end = response.get('end_datetime')
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
-            
-            # Verify time was updated and duration preserved
-            duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
-            time_updated = updated_start_dt.time() == new_start_time.time()
-            duration_preserved = abs(duration_minutes - 60) < 1
-            
-            success = success and time_updated and duration_preserved
-            
-        self.log_test("Update Lesson Time", success, 
-                     f"- New time: {new_start_time.time()}, Duration preserved: {duration_preserved}")
-        return success
-
-    def test_update_lesson_datetime_and_duration(self):
-        """Test updating both start_datetime and duration simultaneously"""
-        if not self.test_lesson_id:
-            self.log_test("Update DateTime and Duration", False, "- No test lesson available")
-            return False
-            
-        # Update to 3 days from now at 10:00 AM with 90 minutes duration
-        three_days_later = datetime.now() + timedelta(days=3)
-        new_start_time = three_days_later.replace(hour=10, minute=0, second=0, microsecond=0)
-        
-        update_data = {
-            "start_datetime": new_start_time.isoformat(),
-            "duration_minutes": 90
-        }
-        
-        success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
-        
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_end = response.get('end_datetime')
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
-            
-            # Verify both datetime and duration were updated
-            duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
-            datetime_updated = updated_start_dt == new_start_time
-            duration_updated = abs(duration_minutes - 90) < 1
-            
-            success = success and datetime_updated and duration_updated
-            
-        self.log_test("Update DateTime and Duration", success, 
-                     f"- DateTime: {datetime_updated}, Duration: {duration_updated} (90 min)")
-        return success
-
-    def test_update_lesson_datetime_with_multiple_instructors(self):
-        """Test updating lesson datetime along with adding multiple instructors"""
+    def test_lesson_update_case(self, case: tuple) -> bool:
+        """PUT one UPDATE_CASES entry and verify the new start time, duration and echoed fields"""
+        name, days_ahead, (hour, minute), fields, expected_duration = case
         if not self.test_lesson_id:
-            self.log_test("Update DateTime + Multiple Instructors", False, "- No test lesson available")
+            self.log_test(name, False, "- No test lesson available")
             return False
             
-        # Update to 4 days from now at 11:30 AM with multiple teachers
-        four_days_later = datetime.now() + timedelta(days=4)
-        new_start_time = four_days_later.replace(hour=11, minute=30, second=0, microsecond=0)
+        new_start_time = self.lesson_time(days_ahead, hour, minute)
         
-        update_data = {
-            "start_datetime": new_start_time.isoformat(),
-            "teacher_ids": [self.created_teacher_id_1, self.created_teacher_id_2],
-            "duration_minutes": 75
-        }
-        
-        success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
-        
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_end = response.get('end_datetime')
-            teacher_names = response.get('teacher_names', [])
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
-            
-            # Verify datetime, duration, and multiple instructors
-            duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
-            datetime_updated = updated_start_dt == new_start_time
-            duration_updated = abs(duration_minutes - 75) < 1
-            multiple_teachers = len(teacher_names) == 2
-            
-            success = success and datetime_updated and duration_updated and multiple_teachers
-            
-        self.log_test("Update DateTime + Multiple Instructors", success, 
-                     f"- DateTime: {datetime_updated}, Duration: {duration_updated}, Teachers: {len(teacher_names)}")
-        return success
-
-    def test_update_lesson_datetime_with_booking_type(self):
-        """Test updating lesson datetime along with booking type"""
-        if not self.test_lesson_id:
-            self.log_test("Update DateTime + Booking Type", False, "- No test lesson available")
-            return False
-            
-        # Update to 5 days from now at 3:00 PM with training booking type
-        five_days_later = datetime.now() + timedelta(days=5)
-        new_start_time = five_days_later.replace(hour=15, minute=0, second=0, microsecond=0)
-        
-        update_data = {
-            "start_datetime": new_start_time.isoformat(),
-            "booking_type": "training",
-            "notes": "Updated to training session with new time"
-        }
+        update_data = {"start_datetime": new_start_time, **fields}
+        if "teacher_ids" in fields:
+            update_data["teacher_ids"] = [getattr(self, f"created_teacher_id_{n}") for n in fields["teacher_ids"]]
         
         success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
-        
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_booking_type = response.get('booking_type')
-            updated_notes = response.get('notes')
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            
-            # Verify datetime, booking type, and notes were updated
-            datetime_updated = updated_start_dt == new_start_time
-            booking_type_updated = updated_booking_type == "training"
-            notes_updated = "training session" in updated_notes.lower()
-            
-            success = success and datetime_updated and booking_type_updated and notes_updated
-            
-        self.log_test("Update DateTime + Booking Type", success, 
-                     f"- DateTime: {datetime_updated}, Type: {updated_booking_type}, Notes: {notes_updated}")
-        return success
-
-    def test_update_lesson_all_fields_simultaneously(self):
-        """Test updating all fields simultaneously (datetime, instructors, booking type, notes)"""
-        if not self.test_lesson_id:
-            self.log_test("Update All Fields Simultaneously", False, "- No test lesson available")
+        if not success:
+            self.log_test(name, False, "- Update request failed")
             return False
             
-        # Update to 6 days from now at 1:15 PM with all changes
-        six_days_later = datetime.now() + timedelta(days=6)
-        new_start_time = six_days_later.replace(hour=13, minute=15, second=0, microsecond=0)
-        
-        update_data = {
-            "start_datetime": new_start_time.isoformat(),
-            "duration_minutes": 120,
-            "teacher_ids": [self.created_teacher_id_2, self.created_teacher_id_3],
-            "booking_type": "party",
-            "notes": "Comprehensive update: Party lesson with multiple instructors and extended duration"
-        }
+        # Parse datetime strings for comparison
+        updated_start_dt = _parse(response.get('start_datetime'))
+        updated_end_dt = _parse(response.get('end_datetime'))
+        duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
         
-        success, response = self.make_request('PUT', f'lessons/{self.test_lesson_id}', update_data, 200)
+        datetime_updated = updated_start_dt == new_start_time
+        duration_correct = expected_duration is None or abs(duration_minutes - expected_duration) < 1
+        mismatched = [field for field in ("booking_type", "notes") if field in fields and response.get(field) != fields[field]]
+        if "teacher_ids" in fields and len(response.get('teacher_names', [])) != len(fields["teacher_ids"]):
+            mismatched.append("teacher_names")
         
-        if success:
-            updated_start = response.get('start_datetime')
-            updated_end = response.get('end_datetime')
-            teacher_names = response.get('teacher_names', [])
-            updated_booking_type = response.get('booking_type')
-            updated_notes = response.get('notes')
-            
-            # Parse datetime strings for comparison
-            updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-            updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
-            
-            # Verify all fields were updated correctly
-            duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
-            datetime_updated = updated_start_dt == new_start_time
-            duration_updated = abs(duration_minutes - 120) < 1
-            teachers_updated = len(teacher_names) == 2
-            booking_type_updated = updated_booking_type == "party"
-            notes_updated = "comprehensive update" in updated_notes.lower()
-            
-            all_fields_updated = (datetime_updated and duration_updated and 
-                                teachers_updated and booking_type_updated and notes_updated)
-            success = success and all_fields_updated
-            
-        self.log_test("Update All Fields Simultaneously", success, 
-                     f"- All fields updated: {all_fields_updated} (DateTime, Duration, Teachers, Type, Notes)")
+        success = datetime_updated and duration_correct and not mismatched
+        self.log_test(name, success, 
+                     f"- DateTime: {datetime_updated}, Duration: {duration_correct} ({duration_minutes:.0f} min), Mismatched: {mismatched or 'none'}")
         return success
 
     def test_update_lesson_to_same_datetime(self):
@@ -489,6 +420,8 @@ class EnhancedLessonTimeEditTester:
 
     def test_multiple_datetime_updates_sequence(self):
         """Test updating lesson time multiple times in sequence"""
+        # Sequence boundary: every PUT below targets the same lesson and each one's end_datetime
+        # depends on the write before it landing first - keep these serial, don't fan them out
         if not self.test_lesson_id:
             self.log_test("Multiple DateTime Updates Sequence", False, "- No test lesson available")
             return False
@@ -521,16 +454,10 @@ class EnhancedLessonTimeEditTester:
         successful_updates = 0
         
         for i, update_info in enumerate(updates):
-            future_date = datetime.now() + timedelta(days=update_info["days_offset"])
-            new_start_time = future_date.replace(
-                hour=update_info["hour"], 
-                minute=update_info["minute"], 
-                second=0, 
-                microsecond=0
-            )
+            new_start_time = self.lesson_time(update_info["days_offset"], update_info["hour"], update_info["minute"])
             
             update_data = {
-                "start_datetime": new_start_time.isoformat(),
+                "start_datetime": new_start_time,
                 "duration_minutes": update_info["duration"],
                 "notes": f"Update #{i+1}: {update_info['description']}"
             }
@@ -542,8 +469,8 @@ class EnhancedLessonTimeEditTester:
                 updated_end = response.get('end_datetime')
                 
                 # Parse and verify
-                updated_start_dt = datetime.fromisoformat(updated_start.replace('Z', ''))
-                updated_end_dt = datetime.fromisoformat(updated_end.replace('Z', ''))
+                updated_start_dt = _parse(updated_start)
+                updated_end_dt = _parse(updated_end)
                 duration_minutes = (updated_end_dt - updated_start_dt).total_seconds() / 60
                 
                 datetime_correct = updated_start_dt == new_start_time
@@ -551,137 +478,87 @@ class EnhancedLessonTimeEditTester:
                 
                 if datetime_correct and duration_correct:
                     successful_updates += 1
-                    print(f"   ✅ Update #{i+1}: {update_info['description']} - {new_start_time.strftime('%Y-%m-%d %H:%M')}")
+                    self.detail(f"   ✅ Update #{i+1}: {update_info['description']} - {new_start_time.strftime('%Y-%m-%d %H:%M')}")
                 else:
-                    print(f"   ❌ Update #{i+1}: DateTime or duration mismatch")
+                    self.detail(f"   ❌ Update #{i+1}: DateTime or duration mismatch")
             else:
-                print(f"   ❌ Update #{i+1}: Request failed")
+                self.detail(f"   ❌ Update #{i+1}: Request failed")
         
         success = successful_updates == len(updates)
         self.log_test("Multiple DateTime Updates Sequence", success, 
                      f"- {successful_updates}/{len(updates)} updates successful")
         return success
 
-    def test_verify_calendar_reflects_updated_times(self):
-        """Test that calendar API reflects updated lesson times"""
+    def test_verify_final_state(self):
+        """Verify calendar, lesson retrieval and data integrity from one batch of concurrent reads"""
+        checks = ("Calendar Reflects Updated Times", "Lesson Retrieval After Updates", "Data Integrity After Updates")
         if not self.test_lesson_id:
-            self.log_test("Calendar Reflects Updated Times", False, "- No test lesson available")
+            for name in checks:
+                self.log_test(name, False, "- No test lesson available")
             return False
             
-        # Get current lesson details
-        success, current_lesson = self.make_request('GET', f'lessons/{self.test_lesson_id}', expected_status=200)
+        # Lesson, student and enrollment reads are independent - fetch them concurrently;
+        # the calendar read needs the lesson date so it follows once the lesson is in
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            student_future = executor.submit(self.make_request, 'GET', f'students/{self.created_student_id}', None, 200)
+            enrollment_future = executor.submit(self.make_request, 'GET', f'students/{self.created_student_id}/enrollments', None, 200)
+            success, lesson = self.make_request('GET', f'lessons/{self.test_lesson_id}', expected_status=200)
+            if success:
+                date_str = _parse(lesson.get('start_datetime')).strftime('%Y-%m-%d')
+                calendar_future = executor.submit(self.make_request, 'GET', f'calendar/daily/{date_str}', None, 200)
+            student_success, student_response = student_future.result()
+            enrollment_success, enrollment_response = enrollment_future.result()
+        
         if not success:
-            self.log_test("Calendar Reflects Updated Times", False, "- Failed to get current lesson")
+            for name in checks:
+                self.log_test(name, False, "- Failed to get lesson")
             return False
             
-        current_start = current_lesson.get('start_datetime')
-        lesson_date = datetime.fromisoformat(current_start.replace('Z', '')).date()
-        
-        # Get daily calendar for the lesson date
-        date_str = lesson_date.strftime('%Y-%m-%d')
-        success, calendar_response = self.make_request('GET', f'calendar/daily/{date_str}', expected_status=200)
+        current_start = lesson.get('start_datetime')
+        current_end = lesson.get('end_datetime')
         
-        if success:
-            calendar_lessons = calendar_response.get('lessons', [])
-            
-            # Find our lesson in the calendar
-            lesson_found = False
-            lesson_time_matches = False
-            
-            for calendar_lesson in calendar_lessons:
-                if calendar_lesson.get('id') == self.test_lesson_id:
-                    lesson_found = True
-                    calendar_start = calendar_lesson.get('start_datetime')
-                    lesson_time_matches = calendar_start == current_start
-                    break
-            
-            success = success and lesson_found and lesson_time_matches
-            
-        self.log_test("Calendar Reflects Updated Times", success, 
+        # Calendar: our lesson appears on its day at the updated time
+        calendar_success, calendar_response = calendar_future.result()
+        calendar_lesson = next((l for l in calendar_response.get('lessons', []) if l.get('id') == self.test_lesson_id), None) if calendar_success else None
+        lesson_found = calendar_lesson is not None
+        lesson_time_matches = lesson_found and calendar_lesson.get('start_datetime') == current_start
+        calendar_ok = lesson_found and lesson_time_matches
+        self.log_test(checks[0], calendar_ok, 
                      f"- Lesson found in calendar: {lesson_found}, Time matches: {lesson_time_matches}")
-        return success
-
-    def test_lesson_retrieval_after_datetime_updates(self):
-        """Test lesson retrieval after multiple datetime updates"""
-        if not self.test_lesson_id:
-            self.log_test("Lesson Retrieval After Updates", False, "- No test lesson available")
-            return False
-            
-        # Get lesson by ID
-        success, response = self.make_request('GET', f'lessons/{self.test_lesson_id}', expected_status=200)
         
-        if success:
-            lesson_id = response.get('id')
-            student_name = response.get('student_name')
-            teacher_names = response.get('teacher_names', [])
-            start_datetime = response.get('start_datetime')
-            end_datetime = response.get('end_datetime')
-            booking_type = response.get('booking_type')
-            notes = response.get('notes')
-            
-            # Verify all expected fields are present and valid
-            fields_present = all([
-                lesson_id == self.test_lesson_id,
-                student_name,
-                len(teacher_names) > 0,
-                start_datetime,
-                end_datetime,
-                booking_type,
-                notes
-            ])
-            
-            # Verify datetime consistency
-            start_dt = datetime.fromisoformat(start_datetime.replace('Z', ''))
-            end_dt = datetime.fromisoformat(end_datetime.replace('Z', ''))
-            datetime_consistent = end_dt > start_dt
-            
-            success = success and fields_present and datetime_consistent
-            
-        self.log_test("Lesson Retrieval After Updates", success, 
+        # Retrieval: all expected fields are present and the datetimes are consistent
+        fields_present = all([
+            lesson.get('id') == self.test_lesson_id,
+            lesson.get('student_name'),
+            len(lesson.get('teacher_names', [])) > 0,
+            current_start,
+            current_end,
+            lesson.get('booking_type'),
+            lesson.get('notes')
+        ])
+        datetime_consistent = bool(current_start and current_end) and _parse(current_end) > _parse(current_start)
+        retrieval_ok = fields_present and datetime_consistent
+        self.log_test(checks[1], retrieval_ok, 
                      f"- All fields present: {fields_present}, DateTime consistent: {datetime_consistent}")
-        return success
-
-    def test_data_integrity_after_updates(self):
-        """Test data integrity after multiple updates"""
-        if not self.test_lesson_id:
-            self.log_test("Data Integrity After Updates", False, "- No test lesson available")
-            return False
-            
-        # Get lesson details
-        success, lesson_response = self.make_request('GET', f'lessons/{self.test_lesson_id}', expected_status=200)
-        if not success:
-            self.log_test("Data Integrity After Updates", False, "- Failed to get lesson")
-            return False
-            
-        # Get student details
-        success, student_response = self.make_request('GET', f'students/{self.created_student_id}', expected_status=200)
-        if not success:
-            self.log_test("Data Integrity After Updates", False, "- Failed to get student")
-            return False
-            
-        # Get enrollment details
-        success, enrollment_response = self.make_request('GET', f'students/{self.created_student_id}/enrollments', expected_status=200)
-        if not success:
-            self.log_test("Data Integrity After Updates", False, "- Failed to get enrollments")
-            return False
-            
-        # Verify data relationships are intact
-        lesson_student_id = lesson_response.get('student_id')
-        lesson_enrollment_id = lesson_response.get('enrollment_id')
-        student_id = student_response.get('id')
-        
-        enrollments = enrollment_response if isinstance(enrollment_response, list) else []
-        enrollment_found = any(e.get('id') == lesson_enrollment_id for e in enrollments)
-        
-        # Verify integrity
-        student_relationship_intact = lesson_student_id == student_id == self.created_student_id
-        enrollment_relationship_intact = enrollment_found
-        
-        success = student_relationship_intact and enrollment_relationship_intact
         
-        self.log_test("Data Integrity After Updates", success, 
+        # Integrity: student and enrollment relationships are intact
+        enrollments = enrollment_response if enrollment_success and isinstance(enrollment_response, list) else []
+        student_relationship_intact = student_success and lesson.get('student_id') == student_response.get('id') == self.created_student_id
+        enrollment_relationship_intact = any(e.get('id') == lesson.get('enrollment_id') for e in enrollments)
+        integrity_ok = student_relationship_intact and enrollment_relationship_intact
+        self.log_test(checks[2], integrity_ok, 
                      f"- Student relationship: {student_relationship_intact}, Enrollment relationship: {enrollment_relationship_intact}")
-        return success
+        
+        return calendar_ok and retrieval_ok and integrity_ok
+
+    def _safe_run(self, test_method):
+        """Run one test method, counting an unexpected exception as a failure"""
+        try:
+            test_method()
+        except Exception as e:
+            print(f"❌ {getattr(test_method, 'func', test_method).__name__} - ERROR: {str(e)}")
+            with self._counter_lock:
+                self.tests_run += 1
 
     def run_all_tests(self):
         """Run all enhanced lesson time edit tests"""
@@ -693,30 +570,22 @@ class EnhancedLessonTimeEditTester:
             print("❌ Failed to setup test data. Aborting tests.")
             return
         
-        # Test sequence
+        # Every check edits or reads back the same lesson, so they run in order; the
+        # invalid-format PUT goes last so it can't change what the update checks read
         test_methods = [
-            self.test_create_initial_lesson,
-            self.test_update_lesson_start_datetime_different_date,
-            self.test_update_lesson_start_datetime_different_time,
-            self.test_update_lesson_datetime_and_duration,
-            self.test_update_lesson_datetime_with_multiple_instructors,
-            self.test_update_lesson_datetime_with_booking_type,
-            self.test_update_lesson_all_fields_simultaneously,
+            *(partial(self.test_lesson_update_case, case) for case in self.UPDATE_CASES),
             self.test_update_lesson_to_same_datetime,
-            self.test_update_lesson_invalid_datetime_format,
             self.test_multiple_datetime_updates_sequence,
-            self.test_verify_calendar_reflects_updated_times,
-            self.test_lesson_retrieval_after_datetime_updates,
-            self.test_data_integrity_after_updates
+            self.test_verify_final_state,
+            self.test_update_lesson_invalid_datetime_format
         ]
         
         # Run all tests
+        self._safe_run(self.test_create_initial_lesson)
         for test_method in test_methods:
-            try:
-                test_method()
-            except Exception as e:
-                print(f"❌ {test_method.__name__} - ERROR: {str(e)}")
-                self.tests_run += 1
+            self._safe_run(test_method)
+        
+        self.session.close()
         
         # Print summary
         print("\n" + "=" * 70)
@@ -734,6 +603,151 @@ class EnhancedLessonTimeEditTester:
         
         print("=" * 70)
 
-if __name__ == "__main__":
+# pytest entry points - run with `pytest -n <workers> enhanced_lesson_time_edit_test.py`.
+# Each xdist worker sets up its own owner/teachers/student and one lesson once;
+# the worker's checks edit that lesson in turn and it is deleted after the last one.
+
+LESSON_CHECKS = (
+    "test_update_lesson_to_same_datetime",
+    "test_update_lesson_invalid_datetime_format",
+    "test_multiple_datetime_updates_sequence",
+    "test_verify_final_state",
+)
+
+@pytest.fixture(scope="session")
+def edit_tester():
     tester = EnhancedLessonTimeEditTester()
-    tester.run_all_tests()
\ No newline at end of file
+    if not tester.setup_test_data():
+        pytest.skip("Failed to setup test data")
+    return tester
+
+@pytest.fixture(scope="session")
+def initial_lesson(edit_tester):
+    created = edit_tester.test_create_initial_lesson()
+    yield created
+    if edit_tester.test_lesson_id:
+        edit_tester.make_request('DELETE', f'lessons/{edit_tester.test_lesson_id}', expected_status=200)
+
+@pytest.fixture
+def lesson_tester(edit_tester, initial_lesson):
+    # Lesson creation has its own test; checks that depend on it skip rather than pile up failures
+    if not initial_lesson:
+        pytest.skip("Initial lesson could not be created")
+    return edit_tester
+
+def test_create_initial_lesson(initial_lesson):
+    assert initial_lesson
+
+@pytest.mark.parametrize("case", EnhancedLessonTimeEditTester.UPDATE_CASES, ids=lambda case: case[0])
+def test_lesson_update(lesson_tester, case):
+    assert lesson_tester.test_lesson_update_case(case)
+
+@pytest.mark.parametrize("check", LESSON_CHECKS)
+def test_lesson_time_edit(lesson_tester, check):
+    assert getattr(lesson_tester, check)()
+
+class MockStudioAPI:
+    """In-process stand-in for the endpoints this suite exercises, used by --mode=mock"""
+
+    def __init__(self):
+        self.students = {}
+        self.teachers = {}
+        self.enrollments = {}
+        self.lessons = {}
+
+    def __call__(self, request):
+        endpoint = urlparse(request.url).path.split('/api/', 1)[-1]
+        body = json.loads(request.body) if request.body else {}
+        status, payload = self.dispatch(request.method, endpoint.split('/'), body)
+        return status, {'Content-Type': 'application/json'}, json.dumps(payload)
+
+    def _lesson_response(self, lesson: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **lesson,
+            "start_datetime": lesson["start_datetime"].isoformat(),
+            "end_datetime": lesson["end_datetime"].isoformat(),
+            "student_name": self.students.get(lesson["student_id"], {}).get("name", "Unknown"),
+            "teacher_names": [self.teachers[t]["name"] for t in lesson["teacher_ids"] if t in self.teachers]
+        }
+
+    def _create(self, store: Dict[str, Any], body: Dict[str, Any]) -> tuple:
+        record = {"id": str(uuid.uuid4()), **body}
+        store[record["id"]] = record
+        return 200, record
+
+    def dispatch(self, method: str, parts: list, body: Dict[str, Any]) -> tuple:
+        resource = parts[0]
+        record_id = parts[1] if len(parts) > 1 else None
+        
+        if resource == 'auth':
+            if record_id == 'login':
+                return 200, {"access_token": "mock-token", "token_type": "bearer"}
+            return 200, {"id": str(uuid.uuid4()), "email": body.get("email")}
+        if resource == 'users':
+            return 200, []
+        if resource == 'calendar':
+            lessons = [self._lesson_response(l) for l in self.lessons.values()
+                       if l["start_datetime"].strftime('%Y-%m-%d') == parts[2]]
+            return 200, {"lessons": lessons}
+        if method == 'POST' and resource in ('students', 'teachers', 'enrollments'):
+            return self._create(getattr(self, resource), body)
+        if resource == 'students' and len(parts) == 3:
+            return 200, [e for e in self.enrollments.values() if e.get("student_id") == record_id]
+        if resource == 'students':
+            if record_id not in self.students:
+                return 404, {"detail": "Student not found"}
+            return 200, self.students[record_id]
+        if resource != 'lessons':
+            return 404, {"detail": "Not Found"}
+            
+        if method == 'POST':
+            start = datetime.fromisoformat(body["start_datetime"])
+            lesson = {
+                "id": str(uuid.uuid4()),
+                "student_id": body["student_id"],
+                "teacher_ids": body.get("teacher_ids", []),
+                "start_datetime": start,
+                "end_datetime": start + timedelta(minutes=body.get("duration_minutes", 60)),
+                "booking_type": body.get("booking_type", "private_lesson"),
+                "notes": body.get("notes"),
+                "enrollment_id": body.get("enrollment_id")
+            }
+            self.lessons[lesson["id"]] = lesson
+            return 200, self._lesson_response(lesson)
+            
+        lesson = self.lessons.get(record_id)
+        if lesson is None:
+            return 404, {"detail": "Lesson not found"}
+        if method == 'PUT':
+            update = {k: v for k, v in body.items() if v is not None}
+            if "start_datetime" in update:
+                try:
+                    start = datetime.fromisoformat(update["start_datetime"])
+                except ValueError:
+                    return 422, {"detail": [{"loc": ["body", "start_datetime"], "msg": "invalid datetime format"}]}
+                duration = update.pop("duration_minutes", None)
+                if duration is None:
+                    duration = (lesson["end_datetime"] - lesson["start_datetime"]).seconds // 60
+                update["start_datetime"] = start
+                update["end_datetime"] = start + timedelta(minutes=duration)
+            lesson.update(update)
+        return 200, self._lesson_response(lesson)
+
+def run_mocked(tester: EnhancedLessonTimeEditTester):
+    """Run the suite against MockStudioAPI instead of the preview host"""
+    import responses
+    
+    api = MockStudioAPI()
+    api_pattern = re.compile(re.escape(tester.api_url) + r"/.*")
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        for method in ('GET', 'POST', 'PUT', 'DELETE'):
+            mock.add_callback(method, api_pattern, callback=api)
+        tester.run_all_tests()
+
+if __name__ == "__main__":
+    mode = next((arg.split('=', 1)[1] for arg in sys.argv[1:] if arg.startswith('--mode=')), 'live')
+    tester = EnhancedLessonTimeEditTester(use_cache=mode == 'live' and "--no-cache" not in sys.argv)
+    if mode == 'mock':
+        run_mocked(tester)
+    else:
+        tester.run_all_tests()
\ No newline at end of file
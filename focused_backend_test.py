@@ -1,108 +1,211 @@
 #!/usr/bin/env python3
 
 import requests
+from urllib3.util.retry import Retry
+import os
 import sys
 import json
-from datetime import datetime, timedelta
+import orjson
+import pytest
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, Any
 
+from auth_cache import forget_owner_token, get_owner_token
+from script_support import build_session, use_cassette
+
+_MISSING = object()
+
+class _ReportingRetry(Retry):
+    """Retry that reports each retry it grants, so a flaky endpoint doesn't pass unnoticed"""
+
+    def __init__(self, *args, report=print, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.report = report
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.report = self.report
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        cause = error or (f"HTTP {response.status}" if response is not None else "unknown error")
+        self.report(f"   ⚠️  Retrying {method} {url} after {cause}")
+        return retry
+
+@lru_cache(maxsize=128)
+def _url_for(api_url: str, endpoint: str) -> str:
+    return f"{api_url}/{endpoint}"
+
 class FocusedBackendTester:
-    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
+    """Focused checks of the endpoints behind the recent frontend fixes.
+
+    Per-check data analysis is only printed with TEST_VERBOSE=1 (e.g.
+    `TEST_VERBOSE=1 python focused_backend_test.py`); otherwise it is held
+    back and shown only for checks that fail.
+    """
+
+    ENDPOINTS = ('dashboard/stats', 'students', 'lessons', 'settings', 'settings/theme',
+                 'settings/theme/selected_theme')
+
+    # Fields each endpoint must return
+    DASHBOARD_REQUIRED = frozenset({'total_classes', 'total_teachers', 'total_students', 'active_enrollments',
+                                    'classes_today', 'lessons_today', 'lessons_attended_today', 'estimated_monthly_revenue'})
+    STUDENT_REQUIRED = frozenset({'name', 'email', 'created_at'})
+    LESSON_REQUIRED = frozenset({'teacher_ids', 'start_datetime'})
+    # Fields reported in the data analysis output
+    STUDENT_FIELDS = frozenset({'name', 'email', 'phone', 'parent_name', 'parent_email', 'notes', 'created_at'})
+    LESSON_FIELDS = frozenset({'teacher_ids', 'teacher_names', 'booking_type', 'start_datetime'})
+
+    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com", use_cache: bool = True):
         self.base_url = base_url
+        self.use_cache = use_cache
         self.api_url = f"{base_url}/api"
+        for endpoint in self.ENDPOINTS:
+            _url_for(self.api_url, endpoint)
         self.token = None
         self.user_id = None
         self.tests_run = 0
         self.tests_passed = 0
+        self._counter_lock = threading.Lock()
+        self._output = threading.local()
+        self._details = threading.local()
+        self.verbose = os.environ.get('TEST_VERBOSE') == '1'
+        # The checks run concurrently and share the GET cache, so every access holds the lock
+        self._get_cache: Dict[tuple, Any] = {}
+        self._cache_lock = threading.Lock()
+        
+        # One pooled keep-alive session for every request
+        # One quick retry on gateway errors/dropped connections; POST is left out since it isn't idempotent
+        retry = _ReportingRetry(total=1, backoff_factor=0.1, status_forcelist=[502, 503, 504],
+                                allowed_methods=['GET', 'PUT', 'DELETE'], raise_on_status=False, report=self.out)
+        self.session = build_session(pool_connections=1, pool_maxsize=16, max_retries=retry)
+
+    def out(self, line: str = ""):
+        """Queue a line for the test running on this thread, or print it outside a test run"""
+        lines = getattr(self._output, 'lines', None)
+        if lines is None:
+            print(line)
+        else:
+            lines.append(line)
+
+    def detail(self, line: str):
+        """Diagnostic output - shown when verbose, otherwise held until the check's log_test"""
+        if self.verbose:
+            self.out(line)
+        else:
+            if getattr(self._details, 'lines', None) is None:
+                self._details.lines = []
+            self._details.lines.append(line)
+
+    def _run_buffered(self, test) -> list:
+        """Run one test and return its output lines so concurrent tests don't interleave"""
+        lines = self._output.lines = []
+        try:
+            test()
+        except Exception:
+            sys.stdout.write(''.join(f"{line}\n" for line in lines))  # Don't lose what led up to the error
+            raise
+        finally:
+            del self._output.lines
+        return lines
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
-        self.tests_run += 1
+        held, self._details.lines = getattr(self._details, 'lines', None) or [], None
+        if not success:
+            for line in held:
+                self.out(line)
+        with self._counter_lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
         if success:
-            self.tests_passed += 1
-            print(f"✅ {name} - PASSED {details}")
+            self.out(f"✅ {name} - PASSED {details}")
         else:
-            print(f"❌ {name} - FAILED {details}")
+            self.out(f"❌ {name} - FAILED {details}")
+
+    def bust_cache(self, prefix: str):
+        """Forget cached GETs under a resource that has just been written"""
+        with self._cache_lock:
+            self._get_cache = {k: v for k, v in self._get_cache.items() if not k[0].startswith(prefix)}
 
-    def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200) -> tuple:
+    def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200,
+                     use_cache: bool = True) -> tuple:
         """Make HTTP request and return success status and response data"""
-        url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
+        key = (endpoint, self.token)
+        if method == 'GET':
+            with self._cache_lock:
+                cached = self._get_cache.get(key, _MISSING) if use_cache else _MISSING
+            if cached is not _MISSING:
+                return True, cached
+        else:
+            self.bust_cache(endpoint.split('/', 1)[0])
+            
+        url = _url_for(self.api_url, endpoint)
+        body = orjson.dumps(data) if data is not None else None
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            response = self.session.request(method, url, data=body, timeout=(2.0, 4.0))
 
             success = response.status_code == expected_status
             
+            if response.status_code == 401 and self.token:
+                # Make the next run register again instead of reusing a token the server rejects
+                forget_owner_token(self.base_url)
+            
             try:
                 response_data = response.json()
             except:
                 response_data = {"raw_response": response.text}
 
             if not success:
-                print(f"   Status: {response.status_code}, Expected: {expected_status}")
-                print(f"   Response: {response_data}")
+                self.out(f"   Status: {response.status_code}, Expected: {expected_status}")
+                self.out(f"   Response: {response_data}")
+            elif method == 'GET' and expected_status == 200:
+                with self._cache_lock:
+                    self._get_cache[key] = response_data
 
             return success, response_data
 
         except requests.exceptions.RequestException as e:
-            print(f"   Request failed: {str(e)}")
+            self.out(f"   Request failed: {str(e)}")
             return False, {"error": str(e)}
 
     def setup_authentication(self):
         """Setup authentication for testing"""
-        # Try to register a new user
-        timestamp = datetime.now().strftime("%H%M%S")
-        user_data = {
-            "email": f"test_owner_{timestamp}@example.com",
-            "name": f"Test Owner {timestamp}",
-            "password": "TestPassword123!",
-            "role": "owner",
-            "studio_name": "Test Dance Studio"
-        }
-        
-        success, response = self.make_request('POST', 'auth/register', user_data, 200)
-        
-        if success:
-            self.user_id = response.get('id')
-            self.test_email = user_data['email']
-            self.test_password = user_data['password']
-            
-            # Now login
-            login_data = {
-                "email": self.test_email,
-                "password": self.test_password
-            }
-            
-            success, response = self.make_request('POST', 'auth/login', login_data, 200)
+        # Owner token is shared with the other testers and cached between runs
+        success = False
+        for attempt in range(2):
+            try:
+                self.token, self.user_id = get_owner_token(self.base_url, self.session, persist=self.use_cache)
+            except requests.exceptions.RequestException as e:
+                self.out(f"   Authentication failed: {str(e)}")
+                self.token = None
+                break
+                
+            self.session.headers['Authorization'] = f'Bearer {self.token}'
             
-            if success:
-                self.token = response.get('access_token')
+            # A cached token may predate a DB reset, so prove it on an owner-only endpoint
+            success, _ = self.make_request('GET', 'users', expected_status=200, use_cache=False)
+            if success or attempt:
+                break
+            forget_owner_token(self.base_url)
                 
-        self.log_test("Authentication Setup", success and self.token is not None, 
+        self.log_test("Authentication Setup", success, 
                      f"- Token received: {'Yes' if self.token else 'No'}")
-        return success and self.token is not None
+        return success
 
     def test_dashboard_stats_health_check(self):
         """Test GET /api/dashboard/stats endpoint to verify backend is responsive and database connectivity"""
-        success, response = self.make_request('GET', 'dashboard/stats', expected_status=200)
+        # Always hit the network - this is the responsiveness check
+        success, response = self.make_request('GET', 'dashboard/stats', expected_status=200, use_cache=False)
         
         if success:
-            required_fields = ['total_classes', 'total_teachers', 'total_students', 'active_enrollments', 
-                             'classes_today', 'lessons_today', 'lessons_attended_today', 'estimated_monthly_revenue']
-            has_all_fields = all(field in response for field in required_fields)
+            missing_fields = self.DASHBOARD_REQUIRED - (response.keys() if isinstance(response, dict) else set())
+            has_all_fields = not missing_fields
             
             if has_all_fields:
                 # Check that we have reasonable data
@@ -110,17 +213,16 @@ class FocusedBackendTester:
                 total_students = response.get('total_students', 0)
                 active_enrollments = response.get('active_enrollments', 0)
                 
-                print(f"   📊 Dashboard Stats:")
-                print(f"      - Total Teachers: {total_teachers}")
-                print(f"      - Total Students: {total_students}")
-                print(f"      - Active Enrollments: {active_enrollments}")
-                print(f"      - Lessons Today: {response.get('lessons_today', 0)}")
-                print(f"      - Estimated Monthly Revenue: ${response.get('estimated_monthly_revenue', 0)}")
+                self.detail(f"   📊 Dashboard Stats:")
+                self.detail(f"      - Total Teachers: {total_teachers}")
+                self.detail(f"      - Total Students: {total_students}")
+                self.detail(f"      - Active Enrollments: {active_enrollments}")
+                self.detail(f"      - Lessons Today: {response.get('lessons_today', 0)}")
+                self.detail(f"      - Estimated Monthly Revenue: ${response.get('estimated_monthly_revenue', 0)}")
                 
                 success = has_all_fields
             else:
-                missing_fields = [field for field in required_fields if field not in response]
-                print(f"   ❌ Missing fields: {missing_fields}")
+                self.detail(f"   ❌ Missing fields: {sorted(missing_fields)}")
                 success = False
             
         self.log_test("Dashboard Stats Health Check", success, 
@@ -137,25 +239,20 @@ class FocusedBackendTester:
             if students_count > 0:
                 # Check that students have all required fields for search/filtering
                 sample_student = response[0]
-                required_fields = ['name', 'email', 'phone', 'parent_name', 'parent_email', 'notes', 'created_at']
+                present = self.STUDENT_FIELDS & sample_student.keys()
+                available_fields = sorted(present)
                 
-                available_fields = []
-                for field in required_fields:
-                    if field in sample_student:
-                        available_fields.append(field)
-                
-                print(f"   👥 Student Data Analysis:")
-                print(f"      - Total Students: {students_count}")
-                print(f"      - Available Fields: {available_fields}")
-                print(f"      - Sample Student: {sample_student.get('name', 'Unknown')}")
+                self.detail(f"   👥 Student Data Analysis:")
+                self.detail(f"      - Total Students: {students_count}")
+                self.detail(f"      - Available Fields: {available_fields}")
+                self.detail(f"      - Sample Student: {sample_student.get('name', 'Unknown')}")
                 
                 # Verify essential fields for search functionality
-                essential_fields = ['name', 'email', 'created_at']
-                has_essential_fields = all(field in sample_student for field in essential_fields)
+                has_essential_fields = self.STUDENT_REQUIRED <= present
                 
                 success = has_essential_fields
             else:
-                print(f"   ℹ️  No students found in database")
+                self.detail(f"   ℹ️  No students found in database")
                 success = True  # Empty result is still a successful API call
             
         self.log_test("Student Management API", success, 
@@ -174,27 +271,24 @@ class FocusedBackendTester:
                 sample_lesson = response[0]
                 
                 # Check for new teacher_ids array format
-                has_teacher_ids = 'teacher_ids' in sample_lesson
-                has_teacher_names = 'teacher_names' in sample_lesson
-                has_booking_type = 'booking_type' in sample_lesson
-                has_datetime = 'start_datetime' in sample_lesson
+                present = self.LESSON_FIELDS & sample_lesson.keys()
                 
-                print(f"   📚 Lesson Data Analysis:")
-                print(f"      - Total Lessons: {lessons_count}")
-                print(f"      - Has teacher_ids array: {has_teacher_ids}")
-                print(f"      - Has teacher_names array: {has_teacher_names}")
-                print(f"      - Has booking_type: {has_booking_type}")
-                print(f"      - Has datetime info: {has_datetime}")
+                self.detail(f"   📚 Lesson Data Analysis:")
+                self.detail(f"      - Total Lessons: {lessons_count}")
+                self.detail(f"      - Has teacher_ids array: {'teacher_ids' in present}")
+                self.detail(f"      - Has teacher_names array: {'teacher_names' in present}")
+                self.detail(f"      - Has booking_type: {'booking_type' in present}")
+                self.detail(f"      - Has datetime info: {'start_datetime' in present}")
                 
-                if has_teacher_ids:
+                if 'teacher_ids' in present:
                     teacher_ids = sample_lesson.get('teacher_ids', [])
                     teacher_names = sample_lesson.get('teacher_names', [])
-                    print(f"      - Sample lesson teachers: {len(teacher_ids)} ({teacher_names})")
+                    self.detail(f"      - Sample lesson teachers: {len(teacher_ids)} ({teacher_names})")
                 
                 # Verify essential fields for instructor stats calculation
-                success = has_teacher_ids and has_datetime
+                success = self.LESSON_REQUIRED <= present
             else:
-                print(f"   ℹ️  No lessons found in database")
+                self.detail(f"   ℹ️  No lessons found in database")
                 success = True  # Empty result is still a successful API call
             
         self.log_test("Lesson Management API", success, 
@@ -208,14 +302,14 @@ class FocusedBackendTester:
             self.log_test("Authentication System", False, "- No token available for testing")
             return False
             
-        # Test accessing a protected endpoint
-        success, response = self.make_request('GET', 'students', expected_status=200)
+        # GET students is public and HEAD isn't routed (405), so use the owner-only users list
+        success, response = self.make_request('GET', 'users', expected_status=200)
         
         if success:
-            print(f"   🔐 Authentication Status:")
-            print(f"      - Token validation: Working")
-            print(f"      - Protected endpoint access: Successful")
-            print(f"      - User role: Owner (full access)")
+            self.detail(f"   🔐 Authentication Status:")
+            self.detail(f"      - Token validation: Working")
+            self.detail(f"      - Protected endpoint access: Successful")
+            self.detail(f"      - User role: Owner (full access)")
         
         self.log_test("Authentication System", success, 
                      f"- JWT token validation and protected endpoint access working")
@@ -234,23 +328,31 @@ class FocusedBackendTester:
             for setting in response:
                 categories.add(setting.get('category', ''))
             
-            print(f"   ⚙️  Settings System Analysis:")
-            print(f"      - Total Settings: {settings_count}")
-            print(f"      - Categories: {sorted(list(categories))}")
+            self.detail(f"   ⚙️  Settings System Analysis:")
+            self.detail(f"      - Total Settings: {settings_count}")
+            self.detail(f"      - Categories: {sorted(list(categories))}")
             
-            # Test getting theme settings specifically (mentioned in previous testing)
-            theme_success, theme_response = self.make_request('GET', 'settings/theme', expected_status=200)
+            # Theme settings and the selected theme are both in the full list; only fall
+            # back to the category/key endpoints when the list doesn't carry them
+            theme_response = [setting for setting in response if setting.get('category') == 'theme']
+            theme_success = bool(theme_response)
+            selected_theme_success = False
+            if not theme_success:
+                theme_success, theme_response = self.make_request('GET', 'settings/theme', expected_status=200)
             
             if theme_success:
                 theme_settings_count = len(theme_response) if isinstance(theme_response, list) else 0
-                print(f"      - Theme Settings: {theme_settings_count}")
+                self.detail(f"      - Theme Settings: {theme_settings_count}")
                 
                 # Check for specific theme setting
-                selected_theme_success, selected_theme_response = self.make_request('GET', 'settings/theme/selected_theme', expected_status=200)
+                selected_theme_response = next((setting for setting in theme_response if setting.get('key') == 'selected_theme'), None)
+                selected_theme_success = selected_theme_response is not None
+                if not selected_theme_success:
+                    selected_theme_success, selected_theme_response = self.make_request('GET', 'settings/theme/selected_theme', expected_status=200)
                 
                 if selected_theme_success:
                     theme_value = selected_theme_response.get('value', 'Unknown')
-                    print(f"      - Current Theme: {theme_value}")
+                    self.detail(f"      - Current Theme: {theme_value}")
             
             success = success and theme_success and selected_theme_success
             
@@ -275,7 +377,7 @@ class FocusedBackendTester:
             print("❌ Failed to setup authentication - cannot continue with protected endpoint tests")
             return False
         
-        # Run all focused tests
+        # Run all focused tests - they only read, so they run concurrently
         tests = [
             self.test_dashboard_stats_health_check,
             self.test_student_management_api,
@@ -284,9 +386,14 @@ class FocusedBackendTester:
             self.test_settings_system
         ]
         
-        for test in tests:
-            test()
-            print()  # Add spacing between tests
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            outputs = list(executor.map(self._run_buffered, tests))
+        
+        # Flush each test's output in one write, in test order, with spacing between tests
+        sys.stdout.write(''.join(f"{line}\n" for lines in outputs for line in [*lines, ""]))
+        sys.stdout.flush()
+        
+        self.session.close()
         
         # Print summary
         print("=" * 80)
@@ -304,9 +411,45 @@ class FocusedBackendTester:
             print("⚠️  Some tests failed - see details above")
             return False
 
+# pytest entry points - run with `pytest -n <workers> focused_backend_test.py`.
+# Every check is a read-only GET, so they shard across xdist workers freely;
+# each worker authenticates once through the shared auth_cache token.
+
+BACKEND_CHECKS = (
+    "test_dashboard_stats_health_check",
+    "test_student_management_api",
+    "test_lesson_management_api",
+    "test_authentication_system",
+    "test_settings_system",
+)
+
+@pytest.fixture(scope="session")
+def backend_tester():
+    tester = FocusedBackendTester()
+    if not tester.setup_authentication():
+        pytest.skip("Failed to setup authentication")
+    yield tester
+    tester.session.close()
+
+@pytest.mark.parametrize("check", BACKEND_CHECKS)
+def test_focused_backend(backend_tester, check):
+    assert getattr(backend_tester, check)()
+
+def run_with_cassette(tester: FocusedBackendTester) -> bool:
+    """Replay recorded API responses, recording them on first use or when REFRESH_CASSETTES=1"""
+    # A token persisted by an earlier run would leave auth/register and auth/login out of
+    # the recording, and a replay after it expires would then hit an unrecorded request
+    tester.use_cache = False
+    # Register bodies carry a fresh email every run, so the cassette matches on the route only
+    with use_cassette(tester.__class__.__name__):
+        return tester.test_comprehensive_api_functionality()
+
 def main():
     tester = FocusedBackendTester()
-    success = tester.test_comprehensive_api_functionality()
+    if "--cassette" in sys.argv:
+        success = run_with_cassette(tester)
+    else:
+        success = tester.test_comprehensive_api_functionality()
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
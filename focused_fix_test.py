@@ -1,74 +1,164 @@
 import requests
-import sys
-import json
-from datetime import datetime, timedelta
+from urllib3.util.retry import Retry
+import itertools
+import os
+import time
+import logging
+import orjson
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
+from script_support import build_session, script_logger, stdout_log_buffer
+
+# Output is buffered and written in batches instead of flushing stdout per line
+log_buffer = stdout_log_buffer()
+
+class _ThreadCapture(logging.Handler):
+    """Holds back records from threads running a concurrent test so each test's output stays together"""
+
+    def __init__(self, target: logging.Handler):
+        super().__init__()
+        self.target = target
+        self.local = threading.local()
+
+    def emit(self, record):
+        records = getattr(self.local, 'records', None)
+        if records is None:
+            self.target.handle(record)
+        else:
+            records.append(record)
+
+    def run_into(self, records: list, fn, *args, **kwargs):
+        """Call fn on this thread with its records appended to records"""
+        self.local.records = records
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            del self.local.records
+
+class _CapturingExecutor(ThreadPoolExecutor):
+    """Thread pool whose workers log into the capture of the thread that submitted the work"""
+
+    def submit(self, fn, *args, **kwargs):
+        records = getattr(_thread_capture.local, 'records', None)
+        if records is None:
+            return super().submit(fn, *args, **kwargs)
+        return super().submit(_thread_capture.run_into, records, fn, *args, **kwargs)
+
+_thread_capture = _ThreadCapture(log_buffer)
+logger = script_logger("focusedfix", _thread_capture)
+
 class FocusedFixTester:
+    USER_REQUIRED = frozenset({'id', 'email', 'name', 'role', 'is_active', 'created_at'})
+
     def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        self.api_prefix = f"{self.api_url}/"
         self.token = None
         self.user_id = None
         self.tests_run = 0
         self.tests_passed = 0
         self.created_teacher_id = None
+        self._counter_lock = threading.Lock()
+        self.teacher_color_endpoint = None
+        
+        # Unique email suffixes: start time + pid across runs, counter within one
+        self._run_tag = f"{int(time.time())}_{os.getpid()}"
+        self._id_counter = itertools.count()
+        
+        # One pooled keep-alive session; Authorization is added per call since the role tests swap tokens
+        # Back off and retry idempotent calls on 5xx/dropped connections instead of failing the run
+        retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504],
+                      allowed_methods=['GET', 'PUT', 'DELETE'], raise_on_status=False)
+        self.session = build_session(max_retries=retry)
+        # Concurrent tests read, fill and bust the GET cache, so every access holds the lock
+        self._get_cache: Dict[tuple, tuple] = {}
+        self._cache_lock = threading.Lock()
+
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, value):
+        # Build the Authorization header once per token change rather than on every request
+        self._token = value
+        self._auth_headers = {'Authorization': f'Bearer {value}'} if value else None
+
+    def unique_suffix(self) -> str:
+        return f"{self._run_tag}_{next(self._id_counter)}"
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
-        self.tests_run += 1
+        with self._counter_lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
         if success:
-            self.tests_passed += 1
-            print(f"✅ {name} - PASSED {details}")
+            logger.info(f"✅ {name} - PASSED {details}")
         else:
-            print(f"❌ {name} - FAILED {details}")
+            logger.info(f"❌ {name} - FAILED {details}")
 
-    def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200) -> tuple:
-        """Make HTTP request and return success status and response data"""
-        url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
+    def bust_cache(self, prefix: str):
+        """Forget cached GETs under a resource that has just been written"""
+        with self._cache_lock:
+            self._get_cache = {k: v for k, v in self._get_cache.items() if not k[0].startswith(prefix)}
+
+    def make_request(self, method: str, endpoint: str, data: Dict[Any, Any] = None, expected_status: int = 200,
+                     token: str = None, body: bool = True) -> tuple:
+        """Make HTTP request and return success status and response data (as `token` if given).
 
+        With body=False only the status is checked and the response is not decoded.
+        """
+        headers = self._auth_headers if token is None else {'Authorization': f'Bearer {token}'}
+        
+        # Successful GETs are reused for 5s per token; any write busts its resource
+        key = (endpoint, self.token if token is None else token)
+        cacheable = method == 'GET' and expected_status == 200
+        if cacheable:
+            with self._cache_lock:
+                cached = self._get_cache.get(key)
+            if cached and time.monotonic() - cached[0] < 5:
+                return True, cached[1]
+        elif method != 'GET':
+            self.bust_cache(endpoint.split('/', 1)[0])
+            
+        url = self.api_prefix + endpoint
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            payload = orjson.dumps(data) if data is not None else None
+            response = self.session.request(method, url, data=payload, headers=headers, timeout=10)
 
             success = response.status_code == expected_status
             
             try:
-                response_data = response.json()
-            except:
+                response_data = orjson.loads(response.content) if body and response.content else {}
+            except orjson.JSONDecodeError:
                 response_data = {"raw_response": response.text}
 
             if not success:
-                print(f"   Status: {response.status_code}, Expected: {expected_status}")
-                print(f"   Response: {response_data}")
+                logger.info(f"   Status: {response.status_code}, Expected: {expected_status}")
+                logger.info(f"   Response: {response_data if body else response.text}")
+            elif cacheable:
+                with self._cache_lock:
+                    self._get_cache[key] = (time.monotonic(), response_data)
 
             return success, response_data
 
         except requests.exceptions.RequestException as e:
-            print(f"   Request failed: {str(e)}")
+            logger.info(f"   Request failed: {str(e)}")
             return False, {"error": str(e)}
 
     def setup_authentication(self):
         """Setup authentication for testing"""
-        print("\n📋 AUTHENTICATION SETUP")
+        logger.info("\n📋 AUTHENTICATION SETUP")
         
         # Register a test user
-        timestamp = datetime.now().strftime("%H%M%S")
+        uid = self.unique_suffix()
         user_data = {
-            "email": f"test_owner_{timestamp}@example.com",
-            "name": f"Test Owner {timestamp}",
+            "email": f"test_owner_{uid}@example.com",
+            "name": f"Test Owner {uid}",
             "password": "TestPassword123!",
             "role": "owner",
             "studio_name": "Test Dance Studio"
@@ -76,7 +166,7 @@ class FocusedFixTester:
         
         success, response = self.make_request('POST', 'auth/register', user_data, 200)
         if not success:
-            print("❌ Cannot proceed without user registration")
+            logger.info("❌ Cannot proceed without user registration")
             return False
             
         self.user_id = response.get('id')
@@ -89,16 +179,16 @@ class FocusedFixTester:
         
         success, response = self.make_request('POST', 'auth/login', login_data, 200)
         if not success:
-            print("❌ Cannot proceed without user login")
+            logger.info("❌ Cannot proceed without user login")
             return False
             
         self.token = response.get('access_token')
-        print(f"✅ Authentication setup complete - Token: {'Yes' if self.token else 'No'}")
+        logger.info(f"✅ Authentication setup complete - Token: {'Yes' if self.token else 'No'}")
         return True
 
     def setup_teacher(self):
         """Create a teacher for color testing"""
-        print("\n📋 SETUP FOR COLOR TESTING")
+        logger.info("\n📋 SETUP FOR COLOR TESTING")
         
         teacher_data = {
             "name": "Jane Smith",
@@ -110,69 +200,72 @@ class FocusedFixTester:
         
         success, response = self.make_request('POST', 'teachers', teacher_data, 200)
         if not success:
-            print("❌ Cannot proceed without teachers for color testing")
+            logger.info("❌ Cannot proceed without teachers for color testing")
             return False
             
         self.created_teacher_id = response.get('id')
-        print(f"✅ Created teacher: {teacher_data['name']} (ID: {self.created_teacher_id})")
+        self.teacher_color_endpoint = f'teachers/{self.created_teacher_id}/color'
+        logger.info(f"✅ Created teacher: {teacher_data['name']} (ID: {self.created_teacher_id})")
         return True
 
     def test_color_validation_fix(self):
         """Test the specific color validation fix mentioned in review request"""
-        print("\n🎨 TESTING COLOR VALIDATION FIX")
+        logger.info("\n🎨 TESTING COLOR VALIDATION FIX")
         
         if not self.created_teacher_id:
             self.log_test("Color Validation Fix", False, "- No teacher ID available")
             return False
         
-        # Test invalid hex codes that should be rejected
-        invalid_hex_codes = ["#gggggg", "#12345", "#abcdefg", "invalid"]
+        invalid_hex_codes = ["#gggggg", "#12345", "#abcdefg", "invalid"]  # should be rejected
+        valid_hex_codes = ["#ff6b6b", "#3b82f6", "#ABCDEF"]  # should be accepted
+        case_test_colors = ["#abcdef", "#ABCDEF", "#AbCdEf"]  # upper/lower case should both work
+        
+        # Each PUT is judged only on its own response, so all of them go out at once
+        def put_color(color, expected_status):
+            # Rejections are judged on status alone; accepted colors need the echoed body
+            return self.make_request('PUT', self.teacher_color_endpoint, {"color": color}, expected_status,
+                                     body=expected_status != 400)
+        
+        colors = invalid_hex_codes + valid_hex_codes + case_test_colors
+        expected = [400] * len(invalid_hex_codes) + [200] * (len(valid_hex_codes) + len(case_test_colors))
+        with _CapturingExecutor(max_workers=len(colors)) as executor:
+            results = list(executor.map(put_color, colors, expected))
+        invalid_results = results[:len(invalid_hex_codes)]
+        valid_results = results[len(invalid_hex_codes):len(invalid_hex_codes) + len(valid_hex_codes)]
+        case_results = results[len(invalid_hex_codes) + len(valid_hex_codes):]
+        
+        lines = []
         invalid_tests_passed = 0
-        
-        print("   Testing invalid hex codes (should be rejected):")
-        for color in invalid_hex_codes:
-            color_data = {"color": color}
-            success, response = self.make_request('PUT', f'teachers/{self.created_teacher_id}/color', 
-                                                color_data, 400)
+        lines.append("   Testing invalid hex codes (should be rejected):")
+        for color, (success, response) in zip(invalid_hex_codes, invalid_results):
             if success:
                 invalid_tests_passed += 1
-                print(f"   ✅ {color}: Correctly rejected with 400 error")
+                lines.append(f"   ✅ {color}: Correctly rejected with 400 error")
             else:
-                print(f"   ❌ {color}: Should have been rejected but wasn't")
+                lines.append(f"   ❌ {color}: Should have been rejected but wasn't")
         
-        # Test valid hex codes that should be accepted
-        valid_hex_codes = ["#ff6b6b", "#3b82f6", "#ABCDEF"]
         valid_tests_passed = 0
-        
-        print("   Testing valid hex codes (should be accepted):")
-        for color in valid_hex_codes:
-            color_data = {"color": color}
-            success, response = self.make_request('PUT', f'teachers/{self.created_teacher_id}/color', 
-                                                color_data, 200)
+        lines.append("   Testing valid hex codes (should be accepted):")
+        for color, (success, response) in zip(valid_hex_codes, valid_results):
             if success:
                 returned_color = response.get('color')
                 if returned_color == color:
                     valid_tests_passed += 1
-                    print(f"   ✅ {color}: Accepted and returned correctly")
+                    lines.append(f"   ✅ {color}: Accepted and returned correctly")
                 else:
-                    print(f"   ❌ {color}: Accepted but returned {returned_color}")
+                    lines.append(f"   ❌ {color}: Accepted but returned {returned_color}")
             else:
-                print(f"   ❌ {color}: Should have been accepted but was rejected")
+                lines.append(f"   ❌ {color}: Should have been accepted but was rejected")
         
-        # Test both uppercase and lowercase hex characters
-        case_test_colors = ["#abcdef", "#ABCDEF", "#AbCdEf"]
         case_tests_passed = 0
-        
-        print("   Testing case sensitivity (all should work):")
-        for color in case_test_colors:
-            color_data = {"color": color}
-            success, response = self.make_request('PUT', f'teachers/{self.created_teacher_id}/color', 
-                                                color_data, 200)
+        lines.append("   Testing case sensitivity (all should work):")
+        for color, (success, response) in zip(case_test_colors, case_results):
             if success:
                 case_tests_passed += 1
-                print(f"   ✅ {color}: Case handled correctly")
+                lines.append(f"   ✅ {color}: Case handled correctly")
             else:
-                print(f"   ❌ {color}: Case sensitivity issue")
+                lines.append(f"   ❌ {color}: Case sensitivity issue")
+        logger.info("\n".join(lines))
         
         total_tests = len(invalid_hex_codes) + len(valid_hex_codes) + len(case_test_colors)
         passed_tests = invalid_tests_passed + valid_tests_passed + case_tests_passed
@@ -182,126 +275,109 @@ class FocusedFixTester:
                      f"- {passed_tests}/{total_tests} color validation tests passed")
         return success
 
+    def provision_role_user(self, role: str, password: str) -> tuple:
+        """Create a user with the given role and log in as them, returning (token, failure message)"""
+        user_data = {
+            "email": f"{role}_fix_test_{self.unique_suffix()}@example.com",
+            "name": f"{role.title()} Fix Test",
+            "password": password,
+            "role": role
+        }
+        
+        success, _ = self.make_request('POST', 'users', user_data, 200)
+        if not success:
+            return None, f"Failed to create {role} user for testing"
+            
+        login_data = {
+            "email": user_data["email"],
+            "password": password
+        }
+        
+        success, login_response = self.make_request('POST', 'auth/login', login_data, 200)
+        if not success:
+            return None, f"Failed to login as {role}"
+        return login_response.get('access_token'), None
+
     def test_user_listing_endpoint_fix(self):
         """Test the specific user listing endpoint fix mentioned in review request"""
-        print("\n👥 TESTING USER LISTING ENDPOINT FIX")
+        logger.info("\n👥 TESTING USER LISTING ENDPOINT FIX")
         
-        # Test with owner role (should work)
-        print("   Testing with owner role:")
         if not self.token:
             self.log_test("User Listing Endpoint Fix", False, "- No owner token available")
             return False
+        
+        # Manager and teacher accounts don't depend on each other, and each probe carries
+        # its own token, so provisioning and the three role probes each go out together
+        with _CapturingExecutor(max_workers=3) as executor:
+            manager_future = executor.submit(self.provision_role_user, "manager", "ManagerPass123!")
+            teacher_future = executor.submit(self.provision_role_user, "teacher", "TeacherPass123!")
+            manager_token, manager_error = manager_future.result()
+            teacher_token, teacher_error = teacher_future.result()
             
-        success, response = self.make_request('GET', 'users', expected_status=200)
+            owner_probe = executor.submit(self.make_request, 'GET', 'users', None, 200)
+            manager_probe = manager_token and executor.submit(self.make_request, 'GET', 'users', None, 200, manager_token)
+            teacher_probe = teacher_token and executor.submit(self.make_request, 'GET', 'users', None, 403, teacher_token)
+            owner_result = owner_probe.result()
+            manager_result = manager_probe.result() if manager_probe else None
+            teacher_result = teacher_probe.result() if teacher_probe else None
+        
+        # Test with owner role (should work)
+        logger.info("   Testing with owner role:")
+        success, response = owner_result
         owner_test_passed = success
         
         if success:
-            users_count = len(response) if isinstance(response, list) else 0
-            print(f"   ✅ Owner role: Successfully retrieved {users_count} users")
+            users_count = len(response) if type(response) is list else 0
+            logger.info(f"   ✅ Owner role: Successfully retrieved {users_count} users")
         else:
-            print(f"   ❌ Owner role: Failed to retrieve users - got error instead of user list")
-        
-        # Create and test with manager role (should work)
-        print("   Testing with manager role:")
-        manager_data = {
-            "email": f"manager_fix_test_{datetime.now().strftime('%H%M%S')}@example.com",
-            "name": "Manager Fix Test",
-            "password": "ManagerPass123!",
-            "role": "manager"
-        }
+            logger.info(f"   ❌ Owner role: Failed to retrieve users - got error instead of user list")
         
-        success, manager_response = self.make_request('POST', 'users', manager_data, 200)
-        if not success:
-            print("   ❌ Manager role: Failed to create manager user for testing")
+        # Test with manager role (should work)
+        logger.info("   Testing with manager role:")
+        if manager_result is None:
+            logger.info(f"   ❌ Manager role: {manager_error}")
             manager_test_passed = False
         else:
-            # Login as manager
-            login_data = {
-                "email": manager_data["email"],
-                "password": manager_data["password"]
-            }
+            success, response = manager_result
+            manager_test_passed = success
             
-            success, login_response = self.make_request('POST', 'auth/login', login_data, 200)
-            if not success:
-                print("   ❌ Manager role: Failed to login as manager")
-                manager_test_passed = False
+            if success:
+                users_count = len(response) if type(response) is list else 0
+                logger.info(f"   ✅ Manager role: Successfully retrieved {users_count} users")
             else:
-                # Save original token and use manager token
-                original_token = self.token
-                self.token = login_response.get('access_token')
-                
-                # Test user listing with manager permissions
-                success, response = self.make_request('GET', 'users', expected_status=200)
-                manager_test_passed = success
-                
-                if success:
-                    users_count = len(response) if isinstance(response, list) else 0
-                    print(f"   ✅ Manager role: Successfully retrieved {users_count} users")
-                else:
-                    print(f"   ❌ Manager role: Failed to retrieve users - got error instead of user list")
-                
-                # Restore original token
-                self.token = original_token
-        
-        # Create and test with teacher role (should get 403)
-        print("   Testing with teacher role (should get 403):")
-        teacher_data = {
-            "email": f"teacher_fix_test_{datetime.now().strftime('%H%M%S')}@example.com",
-            "name": "Teacher Fix Test",
-            "password": "TeacherPass123!",
-            "role": "teacher"
-        }
+                logger.info(f"   ❌ Manager role: Failed to retrieve users - got error instead of user list")
         
-        success, teacher_response = self.make_request('POST', 'users', teacher_data, 200)
-        if not success:
-            print("   ❌ Teacher role: Failed to create teacher user for testing")
+        # Test with teacher role (should get 403)
+        logger.info("   Testing with teacher role (should get 403):")
+        if teacher_result is None:
+            logger.info(f"   ❌ Teacher role: {teacher_error}")
             teacher_test_passed = False
         else:
-            # Login as teacher
-            login_data = {
-                "email": teacher_data["email"],
-                "password": teacher_data["password"]
-            }
+            success, response = teacher_result
+            teacher_test_passed = success
             
-            success, login_response = self.make_request('POST', 'auth/login', login_data, 200)
-            if not success:
-                print("   ❌ Teacher role: Failed to login as teacher")
-                teacher_test_passed = False
+            if success:
+                logger.info(f"   ✅ Teacher role: Correctly denied access with 403")
             else:
-                # Save original token and use teacher token
-                original_token = self.token
-                self.token = login_response.get('access_token')
-                
-                # Test user listing with teacher permissions (should get 403)
-                success, response = self.make_request('GET', 'users', expected_status=403)
-                teacher_test_passed = success
-                
-                if success:
-                    print(f"   ✅ Teacher role: Correctly denied access with 403")
-                else:
-                    print(f"   ❌ Teacher role: Should have been denied access but wasn't")
-                
-                # Restore original token
-                self.token = original_token
+                logger.info(f"   ❌ Teacher role: Should have been denied access but wasn't")
         
         # Check response format and data integrity for owner
-        print("   Testing response format and data integrity:")
+        logger.info("   Testing response format and data integrity:")
         success, response = self.make_request('GET', 'users', expected_status=200)
         format_test_passed = False
         
-        if success and isinstance(response, list) and len(response) > 0:
+        if success and type(response) is list and response:
             first_user = response[0]
-            required_fields = ['id', 'email', 'name', 'role', 'is_active', 'created_at']
-            has_required_fields = all(field in first_user for field in required_fields)
+            missing_fields = self.USER_REQUIRED - first_user.keys()
+            has_required_fields = not missing_fields
             
             if has_required_fields:
                 format_test_passed = True
-                print(f"   ✅ Response format: All required fields present")
+                logger.info(f"   ✅ Response format: All required fields present")
             else:
-                missing_fields = [field for field in required_fields if field not in first_user]
-                print(f"   ❌ Response format: Missing fields: {missing_fields}")
+                logger.info(f"   ❌ Response format: Missing fields: {sorted(missing_fields)}")
         else:
-            print(f"   ❌ Response format: Invalid response structure")
+            logger.info(f"   ❌ Response format: Invalid response structure")
         
         # Overall success
         all_tests_passed = owner_test_passed and manager_test_passed and teacher_test_passed and format_test_passed
@@ -312,61 +388,32 @@ class FocusedFixTester:
 
     def test_overall_system_health_check(self):
         """Test overall system health after the fixes"""
-        print("\n🏥 OVERALL SYSTEM HEALTH CHECK")
-        
-        health_tests = []
-        
-        # Test major endpoints are still working
-        print("   Testing major endpoints:")
-        
-        # Dashboard
-        success, response = self.make_request('GET', 'dashboard/stats', expected_status=200)
-        health_tests.append(("Dashboard Stats", success))
-        if success:
-            print("   ✅ Dashboard stats endpoint working")
-        else:
-            print("   ❌ Dashboard stats endpoint failed")
-        
-        # Teachers
-        success, response = self.make_request('GET', 'teachers', expected_status=200)
-        health_tests.append(("Teachers List", success))
-        if success:
-            print("   ✅ Teachers list endpoint working")
-        else:
-            print("   ❌ Teachers list endpoint failed")
-        
-        # Students
-        success, response = self.make_request('GET', 'students', expected_status=200)
-        health_tests.append(("Students List", success))
-        if success:
-            print("   ✅ Students list endpoint working")
-        else:
-            print("   ❌ Students list endpoint failed")
+        logger.info("\n🏥 OVERALL SYSTEM HEALTH CHECK")
+        
+        # (name, endpoint, label) - all read-only, so they are fetched concurrently
+        checks = [
+            ("Dashboard Stats", 'dashboard/stats', "Dashboard stats endpoint"),
+            ("Teachers List", 'teachers', "Teachers list endpoint"),
+            ("Students List", 'students', "Students list endpoint"),
+            ("Settings System", 'settings', "Settings system"),
+        ]
+        if self.created_teacher_id:
+            checks.append(("Teacher Color Management", self.teacher_color_endpoint, "Teacher color management"))
+        checks.append(("User Management", 'users', "User management"))
         
-        # Settings system
-        success, response = self.make_request('GET', 'settings', expected_status=200)
-        health_tests.append(("Settings System", success))
-        if success:
-            print("   ✅ Settings system working")
-        else:
-            print("   ❌ Settings system failed")
+        logger.info("   Testing major endpoints:")
+        with _CapturingExecutor(max_workers=len(checks)) as executor:
+            results = list(executor.map(lambda check: self.make_request('GET', check[1], expected_status=200), checks))
         
-        # Teacher color management
-        if self.created_teacher_id:
-            success, response = self.make_request('GET', f'teachers/{self.created_teacher_id}/color', expected_status=200)
-            health_tests.append(("Teacher Color Management", success))
+        lines = []
+        health_tests = []
+        for (name, _, label), (success, response) in zip(checks, results):
+            health_tests.append((name, success))
             if success:
-                print("   ✅ Teacher color management working")
+                lines.append(f"   ✅ {label} working")
             else:
-                print("   ❌ Teacher color management failed")
-        
-        # User management CRUD
-        success, response = self.make_request('GET', 'users', expected_status=200)
-        health_tests.append(("User Management", success))
-        if success:
-            print("   ✅ User management working")
-        else:
-            print("   ❌ User management failed")
+                lines.append(f"   ❌ {label} failed")
+        logger.info("\n".join(lines))
         
         # Calculate overall health
         passed_tests = sum(1 for _, success in health_tests if success)
@@ -377,11 +424,16 @@ class FocusedFixTester:
                      f"- {passed_tests}/{total_tests} major endpoints working")
         return overall_health
 
+    def _run_captured(self, test) -> tuple:
+        """Run one test on this thread, returning its result and the log records it produced"""
+        records = []
+        return _thread_capture.run_into(records, test), records
+
     def run_focused_fix_tests(self):
         """Run focused tests for the two specific fixes mentioned in review request"""
-        print("🎯 FOCUSED TESTING FOR SPECIFIC FIXES")
-        print(f"🔗 Testing API at: {self.api_url}")
-        print("=" * 80)
+        logger.info("🎯 FOCUSED TESTING FOR SPECIFIC FIXES")
+        logger.info(f"🔗 Testing API at: {self.api_url}")
+        logger.info("=" * 80)
         
         # Setup
         if not self.setup_authentication():
@@ -391,24 +443,34 @@ class FocusedFixTester:
             return
         
         # Run the specific fix tests
-        print("\n📋 SPECIFIC FIX TESTS")
-        color_fix_success = self.test_color_validation_fix()
-        user_listing_fix_success = self.test_user_listing_endpoint_fix()
-        health_check_success = self.test_overall_system_health_check()
+        logger.info("\n📋 SPECIFIC FIX TESTS")
+        # The three fixes touch disjoint data (one teacher's color, new users, read-only
+        # endpoints) and probes pass tokens explicitly, so they run side by side
+        tests = [
+            self.test_color_validation_fix,
+            self.test_user_listing_endpoint_fix,
+            self.test_overall_system_health_check
+        ]
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            outcomes = list(executor.map(self._run_captured, tests))
+        for _, records in outcomes:
+            for record in records:
+                log_buffer.handle(record)
+        color_fix_success, user_listing_fix_success, health_check_success = (result for result, _ in outcomes)
         
         # Summary
-        print("\n" + "=" * 80)
-        print(f"🏁 FOCUSED FIX TEST SUMMARY")
-        print(f"   Color Validation Fix: {'✅ PASSED' if color_fix_success else '❌ FAILED'}")
-        print(f"   User Listing Fix: {'✅ PASSED' if user_listing_fix_success else '❌ FAILED'}")
-        print(f"   System Health Check: {'✅ PASSED' if health_check_success else '❌ FAILED'}")
-        print(f"   Total Tests: {self.tests_run}")
-        print(f"   Passed: {self.tests_passed}")
-        print(f"   Failed: {self.tests_run - self.tests_passed}")
-        print(f"   Success Rate: {(self.tests_passed/self.tests_run)*100:.1f}%")
+        logger.info("\n" + "=" * 80)
+        logger.info(f"🏁 FOCUSED FIX TEST SUMMARY")
+        logger.info(f"   Color Validation Fix: {'✅ PASSED' if color_fix_success else '❌ FAILED'}")
+        logger.info(f"   User Listing Fix: {'✅ PASSED' if user_listing_fix_success else '❌ FAILED'}")
+        logger.info(f"   System Health Check: {'✅ PASSED' if health_check_success else '❌ FAILED'}")
+        logger.info(f"   Total Tests: {self.tests_run}")
+        logger.info(f"   Passed: {self.tests_passed}")
+        logger.info(f"   Failed: {self.tests_run - self.tests_passed}")
+        logger.info(f"   Success Rate: {(self.tests_passed/self.tests_run)*100:.1f}%")
         
         if color_fix_success and user_listing_fix_success and health_check_success:
-            print("🎉 ALL FOCUSED TESTS PASSED - FIXES VERIFIED!")
+            logger.info("🎉 ALL FOCUSED TESTS PASSED - FIXES VERIFIED!")
         else:
             failed_tests = []
             if not color_fix_success:
@@ -417,10 +479,13 @@ class FocusedFixTester:
                 failed_tests.append("User Listing Fix")
             if not health_check_success:
                 failed_tests.append("System Health Check")
-            print(f"⚠️  Failed tests: {', '.join(failed_tests)}")
+            logger.info(f"⚠️  Failed tests: {', '.join(failed_tests)}")
         
-        print("=" * 80)
+        logger.info("=" * 80)
 
 if __name__ == "__main__":
     tester = FocusedFixTester()
-    tester.run_focused_fix_tests()
\ No newline at end of file
+    try:
+        tester.run_focused_fix_tests()
+    finally:
+        log_buffer.flush()
\ No newline at end of file
@@ -5,17 +5,49 @@ Test what values the frontend is actually sending and how the backend handles th
 """
 
 import requests
-import json
+import orjson
+from auth_cache import forget_login, get_login
+from script_support import build_session, use_cassette
+from concurrent.futures import ThreadPoolExecutor
+import os
 import sys
 from datetime import datetime
 
+ADMIN_EMAIL = "admin@test.com"
+ADMIN_PASSWORD = "admin123"
+
 class FrontendBackendCommunicationTester:
-    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
+    """Checks how the backend stores the values the settings checkboxes send.
+
+    Per-case request/response lines are only printed with TEST_VERBOSE=1 (e.g.
+    `TEST_VERBOSE=1 python frontend_backend_communication_test.py`); issues,
+    failures and the summary are always printed.
+    """
+
+    def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com", use_cache: bool = True):
         self.base_url = base_url
+        self.use_cache = use_cache
         self.api_url = f"{base_url}/api"
+        
+        # One pooled keep-alive session; setting self.token installs or clears its Authorization header
+        self.session = build_session()
+        
         self.token = None
         self.tests_run = 0
         self.tests_passed = 0
+        self.verbose = os.environ.get('TEST_VERBOSE') == '1'
+
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, value):
+        self._token = value
+        if value:
+            self.session.headers['Authorization'] = f'Bearer {value}'
+        else:
+            self.session.headers.pop('Authorization', None)
 
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
@@ -26,29 +58,28 @@ class FrontendBackendCommunicationTester:
         else:
             print(f"❌ {name} - FAILED {details}")
 
+    def detail(self, line: str):
+        """Per-case diagnostic output, shown only when verbose"""
+        if self.verbose:
+            print(line)
+
     def make_request(self, method: str, endpoint: str, data=None, expected_status: int = 200):
         """Make HTTP request and return success status and response data"""
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            body = orjson.dumps(data) if data is not None else None
+            response = self.session.request(method, url, data=body, timeout=10)
 
             success = response.status_code == expected_status
             
+            if response.status_code == 401 and self.token:
+                # Make the next run log in again instead of reusing a token the server rejects
+                forget_login(self.base_url, ADMIN_EMAIL)
+            
             try:
-                response_data = response.json()
-            except:
+                response_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 response_data = {"raw_response": response.text, "status_code": response.status_code}
 
             return success, response_data
@@ -57,16 +88,16 @@ class FrontendBackendCommunicationTester:
             return False, {"error": str(e)}
 
     def authenticate(self):
-        """Authenticate with admin credentials"""
-        login_data = {
-            "email": "admin@test.com",
-            "password": "admin123"
-        }
-        
-        success, response = self.make_request('POST', 'auth/login', login_data, 200)
+        """Authenticate with admin credentials, reusing a recent login from auth_cache"""
+        try:
+            login = get_login(self.base_url, ADMIN_EMAIL, ADMIN_PASSWORD, self.session, persist=self.use_cache)
+            success = True
+        except requests.exceptions.RequestException as e:
+            print(f"   Login failed: {str(e)}")
+            success = False
         
         if success:
-            self.token = response.get('access_token')
+            self.token = login['access_token']
             
         self.log_test("Admin Authentication", success)
         return success
@@ -77,60 +108,50 @@ class FrontendBackendCommunicationTester:
         print("=" * 60)
         
         test_setting = {'category': 'notification', 'key': 'email_notifications_enabled'}
+        endpoint = f"settings/{test_setting['category']}/{test_setting['key']}"
         
         # Test 1: Frontend sends string "false" (common issue)
-        print("\n1. Testing frontend sending string 'false':")
+        self.detail("\n1. Testing frontend sending string 'false':")
         update_data = {"value": "false"}  # String instead of boolean
-        success, response = self.make_request('PUT', f"settings/{test_setting['category']}/{test_setting['key']}", update_data, 200)
+        success, response = self.make_request('PUT', endpoint, update_data, 200)
         
         if success:
             returned_value = response.get('value')
-            print(f"   Input: 'false' (string)")
-            print(f"   Returned: {returned_value} ({type(returned_value).__name__})")
-            print(f"   Issue: String 'false' is truthy in Python, so it becomes True!")
+            self.detail(f"   Input: 'false' (string)")
+            self.detail(f"   Returned: {returned_value} ({type(returned_value).__name__})")
+            self.detail(f"   Issue: String 'false' is truthy in Python, so it becomes True!")
             
-            # Verify by getting the setting again
-            success2, response2 = self.make_request('GET', f"settings/{test_setting['category']}/{test_setting['key']}", expected_status=200)
-            if success2:
-                stored_value = response2.get('value')
-                print(f"   Stored value: {stored_value} ({type(stored_value).__name__})")
-                
-                # This is the bug! String "false" gets stored as "false" (string) which is truthy
-                if isinstance(stored_value, str) and stored_value == "false":
-                    print("   🐛 BUG FOUND: String 'false' stored as string, not converted to boolean False")
-                    return False
+            # The PUT response is the setting as re-read after the update, i.e. the stored value.
+            # This is the bug! String "false" gets stored as "false" (string) which is truthy
+            if isinstance(returned_value, str) and returned_value == "false":
+                print("   🐛 BUG FOUND: String 'false' stored as string, not converted to boolean False")
+                return False
         
         # Test 2: Frontend sends string "true"
-        print("\n2. Testing frontend sending string 'true':")
+        self.detail("\n2. Testing frontend sending string 'true':")
         update_data = {"value": "true"}  # String instead of boolean
-        success, response = self.make_request('PUT', f"settings/{test_setting['category']}/{test_setting['key']}", update_data, 200)
+        success, response = self.make_request('PUT', endpoint, update_data, 200)
         
         if success:
             returned_value = response.get('value')
-            print(f"   Input: 'true' (string)")
-            print(f"   Returned: {returned_value} ({type(returned_value).__name__})")
-            
-            # Verify by getting the setting again
-            success2, response2 = self.make_request('GET', f"settings/{test_setting['category']}/{test_setting['key']}", expected_status=200)
-            if success2:
-                stored_value = response2.get('value')
-                print(f"   Stored value: {stored_value} ({type(stored_value).__name__})")
+            self.detail(f"   Input: 'true' (string)")
+            self.detail(f"   Returned: {returned_value} ({type(returned_value).__name__})")
         
         # Test 3: Correct boolean values
-        print("\n3. Testing correct boolean False:")
+        self.detail("\n3. Testing correct boolean False:")
         update_data = {"value": False}  # Correct boolean
-        success, response = self.make_request('PUT', f"settings/{test_setting['category']}/{test_setting['key']}", update_data, 200)
+        success, response = self.make_request('PUT', endpoint, update_data, 200)
         
         if success:
             returned_value = response.get('value')
-            print(f"   Input: False (boolean)")
-            print(f"   Returned: {returned_value} ({type(returned_value).__name__})")
-            
-            # Verify by getting the setting again
-            success2, response2 = self.make_request('GET', f"settings/{test_setting['category']}/{test_setting['key']}", expected_status=200)
-            if success2:
-                stored_value = response2.get('value')
-                print(f"   Stored value: {stored_value} ({type(stored_value).__name__})")
+            self.detail(f"   Input: False (boolean)")
+            self.detail(f"   Returned: {returned_value} ({type(returned_value).__name__})")
+        
+        # Verify the last write persisted with a single read back
+        success, response = self.make_request('GET', endpoint, expected_status=200)
+        if success:
+            stored_value = response.get('value')
+            self.detail(f"   Stored value: {stored_value} ({type(stored_value).__name__})")
         
         return True
 
@@ -140,15 +161,16 @@ class FrontendBackendCommunicationTester:
         print("=" * 60)
         
         test_setting = {'category': 'theme', 'key': 'animations_enabled'}
+        endpoint = f"settings/{test_setting['category']}/{test_setting['key']}"
         
         # Get current value
-        success, response = self.make_request('GET', f"settings/{test_setting['category']}/{test_setting['key']}", expected_status=200)
+        success, response = self.make_request('GET', endpoint, expected_status=200)
         if not success:
             print("❌ Could not get current setting value")
             return False
             
         current_value = response.get('value')
-        print(f"Current value: {current_value} ({type(current_value).__name__})")
+        self.detail(f"Current value: {current_value} ({type(current_value).__name__})")
         
         # Simulate different ways frontend might send the toggle
         test_cases = [
@@ -191,17 +213,17 @@ class FrontendBackendCommunicationTester:
         issues_found = []
         
         for test_case in test_cases:
-            print(f"\n📤 Testing: {test_case['name']}")
-            print(f"   Sending value: {test_case['value']} ({type(test_case['value']).__name__})")
+            self.detail(f"\n📤 Testing: {test_case['name']}")
+            self.detail(f"   Sending value: {test_case['value']} ({type(test_case['value']).__name__})")
             
             update_data = {"value": test_case['value']}
-            success, response = self.make_request('PUT', f"settings/{test_setting['category']}/{test_setting['key']}", update_data, 200)
+            success, response = self.make_request('PUT', endpoint, update_data, 200)
             
             if success:
                 returned_value = response.get('value')
                 returned_type = type(returned_value).__name__
                 
-                print(f"   📥 Backend returned: {returned_value} ({returned_type})")
+                self.detail(f"   📥 Backend returned: {returned_value} ({returned_type})")
                 
                 # Check if this is problematic
                 if test_case.get('is_problematic'):
@@ -226,7 +248,7 @@ class FrontendBackendCommunicationTester:
                         print(f"   🐛 ISSUE: Integer {returned_value} stored instead of boolean")
                 else:
                     if isinstance(returned_value, bool):
-                        print(f"   ✅ Correct: Boolean value handled properly")
+                        self.detail(f"   ✅ Correct: Boolean value handled properly")
                     else:
                         print(f"   ⚠️  Unexpected: Expected boolean but got {returned_type}")
         
@@ -242,6 +264,7 @@ class FrontendBackendCommunicationTester:
         print("=" * 60)
         
         test_setting = {'category': 'notification', 'key': 'sms_notifications_enabled'}
+        endpoint = f"settings/{test_setting['category']}/{test_setting['key']}"
         
         # Test invalid data types for boolean settings
         invalid_values = [
@@ -255,15 +278,19 @@ class FrontendBackendCommunicationTester:
         
         validation_working = True
         
-        for test_case in invalid_values:
-            print(f"\n📤 Testing invalid value: {test_case['value']} ({test_case['description']})")
-            
-            update_data = {"value": test_case['value']}
-            success, response = self.make_request('PUT', f"settings/{test_setting['category']}/{test_setting['key']}", update_data, 200)
+        # At most one of these values is accepted, so the PUTs can't race each other's
+        # read-back of the stored value and go out together
+        with ThreadPoolExecutor(max_workers=len(invalid_values)) as executor:
+            results = list(executor.map(
+                lambda test_case: self.make_request('PUT', endpoint, {"value": test_case['value']}, 200),
+                invalid_values))
+        
+        for test_case, (success, response) in zip(invalid_values, results):
+            self.detail(f"\n📤 Testing invalid value: {test_case['value']} ({test_case['description']})")
             
             if success:
                 returned_value = response.get('value')
-                print(f"   📥 Backend accepted: {returned_value} ({type(returned_value).__name__})")
+                self.detail(f"   📥 Backend accepted: {returned_value} ({type(returned_value).__name__})")
                 
                 # Check if the backend should have rejected this
                 if not isinstance(returned_value, bool):
@@ -315,9 +342,24 @@ class FrontendBackendCommunicationTester:
         
         return self.tests_passed, self.tests_run
 
+def run_with_cassette(tester: FrontendBackendCommunicationTester) -> tuple:
+    """Replay recorded API responses, recording them on first use or when REFRESH_CASSETTES=1"""
+    # A persisted login would leave auth/login out of the recording, and the replayed token is
+    # scrubbed, so it must not be saved to auth_cache either
+    tester.use_cache = False
+    # The same setting is PUT with different values, some of them concurrently, so the body is part of the match
+    with use_cassette(tester.__class__.__name__, match_body=True):
+        return tester.run_communication_tests()
+
 if __name__ == "__main__":
     tester = FrontendBackendCommunicationTester()
-    passed, total = tester.run_communication_tests()
+    try:
+        if "--cassette" in sys.argv:
+            passed, total = run_with_cassette(tester)
+        else:
+            passed, total = tester.run_communication_tests()
+    finally:
+        tester.session.close()
     
     if passed == total:
         print("\n🎉 All communication tests passed!")
@@ -5,17 +5,39 @@ Simulating exactly what the frontend might be doing
 """
 
 import requests
-import json
+import orjson
+from auth_cache import forget_login, get_login
+from script_support import build_session
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+ADMIN_EMAIL = "admin@test.com"
+ADMIN_PASSWORD = "admin123"
+
 class FrontendSimulationTester:
     def __init__(self, base_url="https://studio-manager-5.preview.emergentagent.com"):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        
+        # One pooled keep-alive session; setting self.token installs or clears its Authorization header
+        self.session = build_session()
+        
         self.token = None
         self.tests_run = 0
         self.tests_passed = 0
 
+    @property
+    def token(self):
+        return self._token
+
+    @token.setter
+    def token(self, value):
+        self._token = value
+        if value:
+            self.session.headers['Authorization'] = f'Bearer {value}'
+        else:
+            self.session.headers.pop('Authorization', None)
+
     def log_test(self, name: str, success: bool, details: str = ""):
         """Log test results"""
         self.tests_run += 1
@@ -26,35 +48,30 @@ class FrontendSimulationTester:
             print(f"❌ {name} - FAILED {details}")
 
     def make_request(self, method: str, endpoint: str, data=None, expected_status: int = 200):
-        """Make HTTP request and return success status and response data"""
+        """Make HTTP request and return success status and response data
+
+        ``data`` may be a dict or a payload already serialized to JSON bytes.
+        """
         url = f"{self.api_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
-        
-        if self.token:
-            headers['Authorization'] = f'Bearer {self.token}'
 
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers, timeout=10)
-            else:
-                return False, {"error": f"Unsupported method: {method}"}
+            body = orjson.dumps(data) if isinstance(data, dict) else data
+            response = self.session.request(method, url, data=body, timeout=10)
 
             success = response.status_code == expected_status
             
+            if response.status_code == 401 and self.token:
+                # Make the next run log in again instead of reusing a token the server rejects
+                forget_login(self.base_url, ADMIN_EMAIL)
+            
             try:
-                response_data = response.json()
-            except:
+                response_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 response_data = {"raw_response": response.text, "status_code": response.status_code}
 
             if not success:
                 print(f"   ⚠️  Status: {response.status_code}, Expected: {expected_status}")
-                print(f"   📄 Response: {json.dumps(response_data, indent=2)}")
+                print(f"   📄 Response: {orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode()}")
 
             return success, response_data
 
@@ -63,17 +80,17 @@ class FrontendSimulationTester:
             return False, {"error": str(e)}
 
     def test_admin_login(self):
-        """Test login with admin credentials"""
-        login_data = {
-            "email": "admin@test.com",
-            "password": "admin123"
-        }
-        
-        success, response = self.make_request('POST', 'auth/login', login_data, 200)
+        """Test login with admin credentials, reusing a recent login from auth_cache"""
+        try:
+            login = get_login(self.base_url, ADMIN_EMAIL, ADMIN_PASSWORD, self.session)
+            success = True
+        except requests.exceptions.RequestException as e:
+            print(f"   🔥 Login failed: {str(e)}")
+            success = False
         
         if success:
-            self.token = response.get('access_token')
-            user_info = response.get('user', {})
+            self.token = login['access_token']
+            user_info = login.get('user', {})
             print(f"   👤 Admin user: {user_info.get('name', 'Unknown')} ({user_info.get('role', 'Unknown')})")
             
         self.log_test("Admin Login", success, f"- Token received: {'Yes' if self.token else 'No'}")
@@ -84,7 +101,7 @@ class FrontendSimulationTester:
         print("🌐 SIMULATING: Frontend loads settings page")
         
         # Frontend typically loads all settings at once
-        success, response = self.make_request('GET', 'settings', 200)
+        success, response = self.make_request('GET', 'settings', expected_status=200)
         
         if success:
             notification_settings = [s for s in response if s.get('category') == 'notification']
@@ -143,7 +160,7 @@ class FrontendSimulationTester:
         print("🌐 SIMULATING: Frontend refreshes settings after save")
         
         # Frontend reloads settings to verify changes
-        success, response = self.make_request('GET', 'settings/notification', 200)
+        success, response = self.make_request('GET', 'settings/notification', expected_status=200)
         
         if success:
             email_setting = next((s for s in response if s.get('key') == 'email_notifications_enabled'), None)
@@ -177,7 +194,7 @@ class FrontendSimulationTester:
             return False
         
         # Load settings fresh
-        success, response = self.make_request('GET', 'settings/notification', 200)
+        success, response = self.make_request('GET', 'settings/notification', expected_status=200)
         
         if success:
             email_setting = next((s for s in response if s.get('key') == 'email_notifications_enabled'), None)
@@ -235,35 +252,23 @@ class FrontendSimulationTester:
         print("🌐 SIMULATING: Concurrent settings update (Save All scenario)")
         
         # Simulate frontend sending multiple updates quickly
-        import threading
-        import time
-        
-        results = []
-        
-        def update_email():
-            success, response = self.make_request('PUT', 'settings/notification/email_notifications_enabled', {"value": False}, 200)
-            results.append(('email', success, response.get('value') if success else None))
-        
-        def update_sms():
-            success, response = self.make_request('PUT', 'settings/notification/sms_notifications_enabled', {"value": False}, 200)
-            results.append(('sms', success, response.get('value') if success else None))
-        
-        def update_booking():
-            success, response = self.make_request('PUT', 'settings/notification/booking_confirmation_email', {"value": False}, 200)
-            results.append(('booking', success, response.get('value') if success else None))
-        
-        # Start all updates concurrently
-        threads = [
-            threading.Thread(target=update_email),
-            threading.Thread(target=update_sms),
-            threading.Thread(target=update_booking)
+        updates = [
+            ('email', 'email_notifications_enabled'),
+            ('sms', 'sms_notifications_enabled'),
+            ('booking', 'booking_confirmation_email')
         ]
         
-        for thread in threads:
-            thread.start()
+        # Serialize the shared payload once instead of in every worker
+        body = orjson.dumps({"value": False})
+        
+        def update(item):
+            setting, key = item
+            success, response = self.make_request('PUT', f'settings/notification/{key}', body, 200)
+            return setting, success, response.get('value') if success else None
         
-        for thread in threads:
-            thread.join()
+        # Send all updates concurrently; map keeps the results in request order
+        with ThreadPoolExecutor(max_workers=len(updates)) as executor:
+            results = list(executor.map(update, updates))
         
         # Check results
         all_successful = all(result[1] for result in results)
@@ -319,4 +324,7 @@ class FrontendSimulationTester:
 
 if __name__ == "__main__":
     tester = FrontendSimulationTester()
-    tester.run_all_tests()
\ No newline at end of file
+    try:
+        tester.run_all_tests()
+    finally:
+        tester.session.close()
\ No newline at end of file
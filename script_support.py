@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Logging, HTTP session and cassette setup shared by the backend test scripts."""
+
+import json
+import logging
+import logging.handlers
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CASSETTE_DIR = 'cassettes'
+# Tokens carry no exp claim and passwords never expire, so neither may reach a cassette
+SCRUBBED = 'SCRUBBED'
+
+def stdout_log_buffer(capacity: int = 200) -> logging.handlers.MemoryHandler:
+    """Handler that writes to stdout in batches instead of flushing per line; errors flush at once"""
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    return logging.handlers.MemoryHandler(capacity=capacity, flushLevel=logging.ERROR, target=stdout_handler)
+
+def script_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    """INFO-level logger that writes only through handler (flush the buffer before exiting)"""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+def build_session(pool_connections: int = 10, pool_maxsize: int = 20, max_retries=0) -> requests.Session:
+    """Keep-alive JSON session with a connection pool sized for the scripts' concurrent calls"""
+    session = requests.Session()
+    session.headers.update({'Content-Type': 'application/json'})
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _scrub_json(body, field: str):
+    """Return body with a top-level JSON field replaced by SCRUBBED, or unchanged if it has none"""
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return body
+    if not isinstance(data, dict) or field not in data:
+        return body
+    data[field] = SCRUBBED
+    return json.dumps(data).encode()
+
+def _scrub_request(request):
+    request.body = _scrub_json(request.body, 'password')
+    return request
+
+def _scrub_response(response):
+    response['body']['string'] = _scrub_json(response['body']['string'], 'access_token')
+    return response
+
+def use_cassette(name: str, match_body: bool = False):
+    """Replay recorded API responses, recording them on first use or when REFRESH_CASSETTES=1.
+
+    Requests match on the route; pass match_body=True when the same route is called with
+    different bodies. Authorization headers, passwords in request bodies and access tokens
+    in response bodies are never written to the cassette; replayed logins return SCRUBBED
+    as the token, so runs under a cassette must not persist it.
+    """
+    import vcr
+
+    match_on = ['method', 'scheme', 'host', 'port', 'path', 'query']
+    if match_body:
+        match_on.append('body')
+    recorder = vcr.VCR(
+        cassette_library_dir=CASSETTE_DIR,
+        record_mode='all' if os.environ.get('REFRESH_CASSETTES') == '1' else 'once',
+        match_on=match_on,
+        filter_headers=['authorization'],
+        # Store bodies decompressed so the response scrubber can read gzipped logins
+        decode_compressed_response=True,
+        before_record_request=_scrub_request,
+        before_record_response=_scrub_response
+    )
+    return recorder.use_cassette(f'{name}.yaml')